@@ -0,0 +1,38 @@
+"""
+Gunicorn configuration of the production server.
+
+WSGI application is served by default:
+    gunicorn zeton_backend.wsgi:application
+ASGI application requires Uvicorn workers:
+    GUNICORN_WORKER_CLASS=uvicorn_worker.UvicornWorker \\
+        gunicorn zeton_backend.asgi:application
+
+All settings can be changed with 'GUNICORN_*' environment variables.
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+
+# Worker model.
+# Threads are used only by the default worker class ('sync' is switched to
+# 'gthread' when there is more than one thread).
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("GUNICORN_THREADS", "1"))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")
+
+# Workers are gracefully restarted after handling a number of requests,
+# jitter prevents all of them from restarting at once.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# Django is loaded once in the master process and shared by forked workers.
+# Database connections are opened lazily, so none are inherited.
+preload_app = os.getenv("GUNICORN_PRELOAD", "True") == "True"
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Compare serialize and render time of 'JSONRenderer' and 'ORJSONRenderer'.
+
+Payload is a points history of given number of 'Point' entries, serialized
+by 'PointSerializer'. Points are built in memory, so no database is needed:
+
+    ./scripts/bench_json_renderer.py --points 10000
+"""
+
+import os
+import statistics
+import sys
+import time
+from argparse import ArgumentParser
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "zeton_backend.settings")
+
+
+def build_points(count: int) -> list:
+    from django.utils import timezone
+
+    from users.models import Point
+
+    now = timezone.now()
+    return [
+        Point(
+            pk=index + 1,
+            value=index % 50,
+            assigner_id=1,
+            student_id=2,
+            assignment_date=now - timezone.timedelta(minutes=index),
+            points_type=Point.TASK_TYPE if index % 3 else Point.PRIZE_TYPE,
+            content_type_id=7,
+            object_id=index % 20 + 1,
+            name=f"Zadanie {index % 20}",
+        )
+        for index in range(count)
+    ]
+
+
+def measure(function, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _report(name: str, timings: list[float]) -> None:
+    timings_ms = [timing * 1000 for timing in timings]
+    print(
+        f"{name:<24} mean {statistics.mean(timings_ms):9.3f} ms   "
+        f"min {min(timings_ms):9.3f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Benchmark JSON renderers.")
+    parser.add_argument(
+        "--points",
+        type=int,
+        default=10000,
+        help="Number of points in the payload. Default: %(default)s",
+    )
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=20,
+        help="Number of repetitions. Default: %(default)s",
+    )
+    args = parser.parse_args()
+
+    import django
+
+    django.setup()
+
+    from rest_framework.renderers import JSONRenderer
+
+    from users.serializers import PointSerializer
+    from zeton_backend.renderers import ORJSONRenderer
+
+    points = build_points(args.points)
+    data = PointSerializer(points, many=True).data
+    if JSONRenderer().render(data) != ORJSONRenderer().render(data):
+        sys.exit("Renderers produce different output.")
+
+    _report(
+        "PointSerializer",
+        measure(lambda: PointSerializer(points, many=True).data, args.repeat),
+    )
+    for renderer in (JSONRenderer(), ORJSONRenderer()):
+        _report(
+            type(renderer).__name__,
+            measure(lambda: renderer.render(data), args.repeat),
+        )
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Compare serialize time of list serializers and their '.values()' variants.
+
+Payloads are built in memory, so no database is needed: model instances for
+serializers and equivalent '.values()' rows for '.values()' serializers.
+Time of loading rows from the database is not included.
+
+    ./scripts/bench_read_serializers.py --rows 10000
+"""
+
+import os
+import statistics
+import sys
+import time
+from argparse import ArgumentParser
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "zeton_backend.settings")
+
+
+def build_points(count: int) -> list:
+    from django.utils import timezone
+
+    from users.models import Point
+
+    now = timezone.now()
+    return [
+        Point(
+            pk=index + 1,
+            value=index % 50,
+            assigner_id=1,
+            student_id=2,
+            assignment_date=now - timezone.timedelta(minutes=index),
+            points_type=Point.TASK_TYPE if index % 3 else Point.PRIZE_TYPE,
+            content_type_id=7,
+            object_id=index % 20 + 1,
+            name=f"Zadanie {index % 20}",
+        )
+        for index in range(count)
+    ]
+
+
+def build_tasks(count: int) -> list:
+    from users.models import Task
+
+    return [
+        Task(pk=index + 1, student_id=2, name=f"Zadanie {index}", value=index % 50)
+        for index in range(count)
+    ]
+
+
+def as_rows(instances: list, columns: tuple[str, ...]) -> list[dict]:
+    """
+    Return '.values()' rows of model instances.
+    """
+    return [
+        {
+            column: getattr(instance, "pk" if column == "id" else column)
+            for column in columns
+        }
+        for instance in instances
+    ]
+
+
+def measure(function, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _report(name: str, timings: list[float]) -> None:
+    timings_ms = [timing * 1000 for timing in timings]
+    print(
+        f"{name:<24} mean {statistics.mean(timings_ms):9.3f} ms   "
+        f"min {min(timings_ms):9.3f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Benchmark read serializers.")
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=10000,
+        help="Number of rows in each payload. Default: %(default)s",
+    )
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=20,
+        help="Number of repetitions. Default: %(default)s",
+    )
+    args = parser.parse_args()
+
+    import django
+
+    django.setup()
+
+    from users.serializers import (
+        PointSerializer,
+        PointValuesSerializer,
+        TaskSerializer,
+        TaskValuesSerializer,
+    )
+
+    payloads = [
+        (build_points(args.rows), PointSerializer, PointValuesSerializer),
+        (build_tasks(args.rows), TaskSerializer, TaskValuesSerializer),
+    ]
+    for instances, serializer_class, values_serializer_class in payloads:
+        rows = as_rows(instances, values_serializer_class.columns)
+        expected = list(serializer_class(instances, many=True).data)
+        if values_serializer_class(rows, many=True).data != expected:
+            sys.exit(f"{values_serializer_class.__name__} produces different output.")
+
+        _report(
+            serializer_class.__name__,
+            measure(lambda: serializer_class(instances, many=True).data, args.repeat),
+        )
+        _report(
+            values_serializer_class.__name__,
+            measure(lambda: values_serializer_class(rows, many=True).data, args.repeat),
+        )
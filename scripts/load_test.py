@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Load test of student and points endpoints.
+
+Requests are made by several client processes, each with a number of
+threads using keep-alive connections, so the client itself can use all cores.
+Requests per second and latency percentiles are reported for each endpoint.
+"""
+
+import http.client
+import json
+import statistics
+import threading
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+# Endpoints under test, '{student_id}' is replaced with tested student ID.
+ENDPOINTS = [
+    "students/",
+    "students/{student_id}/",
+    "students/{student_id}/points/",
+    "students/{student_id}/tasks/",
+    "students/{student_id}/prizes/",
+]
+
+
+def get_access_token(base_url: str, username: str, password: str) -> str:
+    parts = urlsplit(base_url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port)
+    body = json.dumps({"username": username, "password": password})
+    headers = {"Content-Type": "application/json"}
+    connection.request("POST", f"{parts.path}token-auth/", body, headers)
+    response = connection.getresponse()
+    if response.status != 200:
+        raise RuntimeError(f"Authentication failed with status {response.status}.")
+    return json.loads(response.read())["access"]
+
+
+def _run_thread(
+    base_url: str, path: str, token: str, deadline: float, results: list
+) -> None:
+    parts = urlsplit(base_url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port)
+    headers = {"Authorization": f"Bearer {token}"}
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        connection.request("GET", f"{parts.path}{path}", headers=headers)
+        response = connection.getresponse()
+        response.read()
+        results.append((time.perf_counter() - start, response.status))
+
+
+def run_client(
+    base_url: str, path: str, token: str, threads: int, duration: float
+) -> list[tuple[float, int]]:
+    """
+    Run single client process, return latency and status of each request.
+    """
+    deadline = time.perf_counter() + duration
+    results = []
+    workers = [
+        threading.Thread(
+            target=_run_thread, args=(base_url, path, token, deadline, results)
+        )
+        for _ in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return results
+
+
+def _percentile(sorted_values: list[float], percentile: float) -> float:
+    index = max(0, int(round(len(sorted_values) * percentile)) - 1)
+    return sorted_values[index]
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Load test of student and points endpoints.")
+    parser.add_argument(
+        "--base_url",
+        default="http://localhost:8080/api/",
+        help="Base API URL. Default: %(default)s",
+    )
+    parser.add_argument("-u", "--username", default="opiekun1", help="User name.")
+    parser.add_argument("-p", "--password", default="opiekun1", help="Password.")
+    parser.add_argument(
+        "--student_id", type=int, default=2, help="Student ID. Default: %(default)s"
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=4,
+        help="Number of client processes. Default: %(default)s",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=8,
+        help="Number of threads of each client process. Default: %(default)s",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=10.0,
+        help="Duration of test of a single endpoint in seconds. Default: %(default)s",
+    )
+    args = parser.parse_args()
+
+    token = get_access_token(args.base_url, args.username, args.password)
+    print(
+        f"{'endpoint':<36} {'requests':>9} {'errors':>7} {'req/s':>9} "
+        f"{'p50 ms':>8} {'p99 ms':>8}"
+    )
+    for endpoint in ENDPOINTS:
+        path = endpoint.format(student_id=args.student_id)
+        with ProcessPoolExecutor(args.processes) as executor:
+            futures = [
+                executor.submit(
+                    run_client, args.base_url, path, token, args.threads, args.duration
+                )
+                for _ in range(args.processes)
+            ]
+            results = [result for future in futures for result in future.result()]
+
+        latencies = sorted(latency * 1000 for latency, _ in results)
+        errors = sum(1 for _, status in results if status != 200)
+        print(
+            f"{path:<36} {len(results):>9} {errors:>7} "
+            f"{len(results) / args.duration:>9.1f} "
+            f"{statistics.median(latencies):>8.2f} {_percentile(latencies, 0.99):>8.2f}"
+        )
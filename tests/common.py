@@ -3,20 +3,52 @@ Module for common testing utilities.
 """
 
 import random
+from contextlib import contextmanager
 from string import ascii_letters
 from typing import Any
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from users.access import bump_access_versions
+from users.models import CustomUser, Role, Student
+from zeton_backend.query_detector import QueryDetector
 
-class EndpointTestCase(TestCase):
+
+class QueryDetectorMixin:
+    """
+    Test case mixin checking SQL queries with 'QueryDetector'.
+    """
+
+    @contextmanager
+    def assertNoQueryProblems(self, **thresholds):
+        """
+        Fail if duplicated, N+1 or slow queries are executed within the context.
+
+        Parameters
+        ----------
+        thresholds
+            'QueryDetector' thresholds, settings are used by default.
+        """
+        detector = QueryDetector(**thresholds)
+        with connection.execute_wrapper(detector):
+            yield detector
+        problems = detector.problems()
+        if problems:
+            self.fail("Query problems:\n" + "\n".join(map(str, problems)))
+
+
+class EndpointTestCase(QueryDetectorMixin, TestCase):
     """
     Endpoint test case base class.
     """
 
     def setUp(self):
         self.client = APIClient()
+        # Rolled back test transactions don't invalidate cached data.
+        cache.clear()
 
     def get(self, endpoint_url: str, token: str | None = None):
         """
@@ -94,6 +126,39 @@ class EndpointTestCase(TestCase):
             endpoint_url, HTTP_AUTHORIZATION=f"Bearer {access_token}"
         )
 
+    def add_students(self, count: int, prefix: str, **student_fields) -> list[Student]:
+        """
+        Helper method to add students assigned to current user.
+        Rows are bulk inserted, so effects of skipped signals are applied here.
+
+        Parameters
+        ----------
+        count : int
+            Number of students to add.
+        prefix : str
+            Prefix of usernames of added students.
+        student_fields
+            Fields of added students, 'total_points' is 0 by default.
+        """
+        student_fields.setdefault("total_points", 0)
+        users = CustomUser.objects.bulk_create(
+            CustomUser(username=f"{prefix}_{index}") for index in range(count)
+        )
+        students = Student.objects.bulk_create(
+            Student(user=user, **student_fields) for user in users
+        )
+        Role.objects.bulk_create(
+            Role(
+                role_name="caregiver",
+                caregiver_id=1,
+                student=student,
+                total_points=student.total_points,
+            )
+            for student in students
+        )
+        bump_access_versions([1])
+        return students
+
     def access_token(self) -> str:
         """
         Get access token.
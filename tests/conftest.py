@@ -1,3 +1,5 @@
+from io import StringIO
+
 import pytest
 from django.core.management import call_command
 
@@ -12,3 +14,4 @@ def django_db_setup(django_db_setup, django_db_blocker):
         call_command("loaddata", "prizes")
         call_command("loaddata", "roles")
         call_command("loaddata", "points")
+        call_command("rebuild_daily_points", stdout=StringIO())
@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from users.access import _version_key, get_access
+from users.models import Caregiver, Role
+
+from .common import EndpointTestCase
+
+
+class TestAccessCache(EndpointTestCase):
+    """
+    Tests for caching of caregiver's access to students.
+    """
+
+    VALID_URL = "/api/students/2/"
+    NOT_PERMITTED_URL = "/api/students/1/"
+
+    def test_Cached(self):
+        token = self.access_token()
+        # Points history isn't stored in the response cache.
+        url = "/api/students/2/points/"
+        with CaptureQueriesContext(connection) as cold:
+            assert self.get(url, token).status_code == status.HTTP_200_OK
+        with CaptureQueriesContext(connection) as warm:
+            assert self.get(url, token).status_code == status.HTTP_200_OK
+
+        # Caregivers and roles are read once and then served from the cache.
+        assert len(warm) == len(cold) - 2
+
+    def test_NoQueriesWhenCached(self):
+        user_id = Caregiver.objects.get(pk=1).user_id
+        get_access(SimpleNamespace(user=SimpleNamespace(id=user_id)))
+
+        with self.assertNumQueries(0):
+            access = get_access(SimpleNamespace(user=SimpleNamespace(id=user_id)))
+        assert access.caregiver_id == 1
+        assert 2 in access.student_ids
+
+    def test_InvalidatedOnRoleSave(self):
+        token = self.access_token()
+        self.assert_not_found(self.get(self.NOT_PERMITTED_URL, token))
+
+        Role.objects.create(role_name="caregiver", caregiver_id=1, student_id=1)
+        response = self.get(self.NOT_PERMITTED_URL, token)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_InvalidatedOnRoleDelete(self):
+        token = self.access_token()
+        assert self.get(self.VALID_URL, token).status_code == status.HTTP_200_OK
+
+        Role.objects.filter(caregiver_id=1, student_id=2).delete()
+        self.assert_not_found(self.get(self.VALID_URL, token))
+
+    def test_InvalidatedOnCaregiverSave(self):
+        token = self.access_token()
+        user_id = Caregiver.objects.get(pk=1).user_id
+        Caregiver.objects.filter(pk=1).delete()
+        self.assert_not_found(self.get(self.VALID_URL, token))
+
+        caregiver = Caregiver.objects.create(user_id=user_id)
+        Role.objects.create(role_name="caregiver", caregiver=caregiver, student_id=2)
+        assert self.get(self.VALID_URL, token).status_code == status.HTTP_200_OK
+
+    def test_VersionLost(self):
+        token = self.access_token()
+        self.assert_not_found(self.get(self.NOT_PERMITTED_URL, token))
+
+        # Role is added without signals, while the version is evicted.
+        Role.objects.bulk_create(
+            [Role(role_name="caregiver", caregiver_id=1, student_id=1)]
+        )
+        cache.delete(_version_key(Caregiver.objects.get(pk=1).user_id))
+
+        # Access cached with the previous version isn't used.
+        response = self.get(self.NOT_PERMITTED_URL, token)
+        assert response.status_code == status.HTTP_200_OK
@@ -0,0 +1,95 @@
+from asgiref.sync import sync_to_async
+from django.test import AsyncRequestFactory
+from rest_framework import status
+
+from users.async_views import (
+    AsyncPointResource,
+    AsyncPrizesResource,
+    AsyncSingleStudentResource,
+    AsyncStudentsResource,
+    AsyncTasksResource,
+)
+
+from .common import EndpointTestCase
+
+
+class TestAsyncViews(EndpointTestCase):
+    """
+    Tests for async variants of GET endpoints.
+    Responses must be the same as responses of synchronous endpoints.
+    """
+
+    # Async resource, URL of synchronous endpoint and URL arguments.
+    RESOURCES = [
+        (AsyncStudentsResource, "/api/students/", {}),
+        (AsyncSingleStudentResource, "/api/students/2/", {"student_id": 2}),
+        (AsyncPrizesResource, "/api/students/2/prizes/", {"student_id": 2}),
+        (AsyncTasksResource, "/api/students/2/tasks/", {"student_id": 2}),
+        (AsyncPointResource, "/api/students/2/points/", {"student_id": 2}),
+    ]
+
+    async def _async_get(self, resource, url: str, token: str | None, **kwargs):
+        """
+        Helper method to make a GET request to async resource.
+        """
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        request = AsyncRequestFactory().get(url, headers=headers)
+        response = await resource.as_view()(request, **kwargs)
+        response.render()
+        return response
+
+    async def test_Success(self):
+        token = await sync_to_async(self.access_token)()
+        for resource, url, kwargs in self.RESOURCES:
+            response = await self._async_get(resource, url, token, **kwargs)
+            sync_response = await sync_to_async(self.get)(url, token)
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.content == sync_response.content
+
+    async def test_Paginated(self):
+        token = await sync_to_async(self.access_token)()
+        url = "/api/students/2/points/?page_size=2"
+        response = await self._async_get(AsyncPointResource, url, token, student_id=2)
+        sync_response = await sync_to_async(self.get)(url, token)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == sync_response.content
+
+    async def test_SparseFields(self):
+        token = await sync_to_async(self.access_token)()
+        for resource, url, kwargs in self.RESOURCES:
+            url = f"{url}?fields=pk"
+            response = await self._async_get(resource, url, token, **kwargs)
+            sync_response = await sync_to_async(self.get)(url, token)
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.content == sync_response.content
+
+    async def test_Forbidden(self):
+        token = await sync_to_async(self.access_token)()
+        response = await self._async_get(
+            AsyncTasksResource, "/api/students/1/tasks/", token, student_id=1
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_NoToken(self):
+        response = await self._async_get(AsyncStudentsResource, "/api/students/", None)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_NotModified(self):
+        token = await sync_to_async(self.access_token)()
+        url = "/api/students/2/tasks/"
+        response = await self._async_get(AsyncTasksResource, url, token, student_id=2)
+        sync_response = await sync_to_async(self.get)(url, token)
+        assert response.headers["ETag"] == sync_response.headers["ETag"]
+
+        request = AsyncRequestFactory().get(
+            url,
+            headers={
+                "Authorization": f"Bearer {token}",
+                "If-None-Match": response.headers["ETag"],
+            },
+        )
+        response = await AsyncTasksResource.as_view()(request, student_id=2)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
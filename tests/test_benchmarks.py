@@ -0,0 +1,386 @@
+"""
+Endpoint benchmarks with budgets.
+
+Every endpoint of 'users.urls' is measured at several data sizes: number of
+SQL queries, median latency and peak memory allocated while handling the
+request. Results are compared with baseline stored in 'benchmarks.json':
+
+- Number of queries must not exceed the baseline and must not depend on the
+  data size, so N+1 queries are caught.
+- Latency and allocations must stay within 'LATENCY_TOLERANCE' and
+  'ALLOCATIONS_TOLERANCE' times the baseline, plus a small absolute margin.
+
+Latency and allocations depend on the machine, they are measured and checked
+only with 'BENCHMARK_TIMINGS=1', on a machine comparable with the one which
+recorded the baseline. Number of queries is always checked.
+
+Caches are cleared before each request, so the uncached path is measured.
+Baseline is updated by running benchmarks with 'BENCHMARK_UPDATE=1':
+
+    BENCHMARK_UPDATE=1 pytest tests/test_benchmarks.py
+"""
+
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from users import urls
+from users.models import CustomUser, Point, Prize, Role, Task
+
+from .common import EndpointTestCase
+
+BASELINE_PATH = Path(__file__).with_name("benchmarks.json")
+
+# Numbers of students of the caregiver and tasks, prizes and points of a student.
+SIZES = (10, 100, 1000)
+# Number of measured requests of each benchmark and size.
+REPEAT = 5
+
+# Latency and allocations are measured with baseline updates too.
+TIMINGS = bool(os.getenv("BENCHMARK_TIMINGS") or os.getenv("BENCHMARK_UPDATE"))
+LATENCY_TOLERANCE = float(os.getenv("BENCHMARK_LATENCY_TOLERANCE", "3.0"))
+LATENCY_MARGIN_MS = 25.0
+ALLOCATIONS_TOLERANCE = float(os.getenv("BENCHMARK_ALLOCATIONS_TOLERANCE", "1.5"))
+ALLOCATIONS_MARGIN_KIB = 256.0
+
+
+class Benchmark(NamedTuple):
+    """
+    Request of a single endpoint.
+
+    'url' and 'data' can be callables, which are called with the test case
+    before each request, eg. to create an object to delete.
+    """
+
+    name: str
+    route: str
+    method: str
+    url: str | Callable
+    data: Any = None
+
+
+def _new_task_url(case) -> str:
+    task = Task.objects.create(student_id=2, name="Usuwane", value=1)
+    return f"/api/students/2/task/{task.pk}/"
+
+
+def _new_prize_url(case) -> str:
+    prize = Prize.objects.create(student_id=2, name="Usuwana", value=1)
+    return f"/api/students/2/prize/{prize.pk}/"
+
+
+def _new_student_data(case) -> dict:
+    case.created += 1
+    return {
+        "email": f"benchmark{case.created}@example.com",
+        "username": f"benchmark_{case.created}",
+        "first_name": "Jan",
+        "last_name": "Kowalski",
+        "total_points": 0,
+    }
+
+
+BENCHMARKS = [
+    Benchmark(
+        "token-auth",
+        "token-auth/",
+        "post",
+        "/api/token-auth/",
+        {"username": "opiekun1", "password": "opiekun1"},
+    ),
+    Benchmark("current-user", "current-user/", "get", "/api/current-user/"),
+    Benchmark("cache-stats", "cache-stats/", "get", "/api/cache-stats/"),
+    Benchmark("metrics", "metrics/", "get", "/api/metrics/"),
+    Benchmark("dashboard", "dashboard/", "get", "/api/dashboard/"),
+    Benchmark("students", "students/", "get", "/api/students/"),
+    Benchmark(
+        "students-fields",
+        "students/",
+        "get",
+        "/api/students/?fields=pk,total_points",
+    ),
+    Benchmark(
+        "students-post", "students/", "post", "/api/students/", _new_student_data
+    ),
+    Benchmark(
+        "bulk-points-post",
+        "students/points/",
+        "post",
+        "/api/students/points/",
+        [{"student": 2, "content_type": "task", "object_id": 2}] * 10,
+    ),
+    Benchmark("ranking", "students/ranking/", "get", "/api/students/ranking/"),
+    Benchmark("student", "students/<int:student_id>/", "get", "/api/students/2/"),
+    Benchmark(
+        "student-rank",
+        "students/<int:student_id>/rank/",
+        "get",
+        "/api/students/2/rank/",
+    ),
+    Benchmark(
+        "student-patch",
+        "students/<int:student_id>/",
+        "patch",
+        "/api/students/2/",
+        {"first_name": "Jan"},
+    ),
+    Benchmark(
+        "points",
+        "students/<int:student_id>/points/",
+        "get",
+        "/api/students/2/points/",
+    ),
+    Benchmark(
+        "points-page",
+        "students/<int:student_id>/points/",
+        "get",
+        "/api/students/2/points/?page_size=50",
+    ),
+    Benchmark(
+        "points-post",
+        "students/<int:student_id>/points/",
+        "post",
+        "/api/students/2/points/",
+        {"content_type": "task", "object_id": 2},
+    ),
+    Benchmark(
+        "points-export",
+        "students/<int:student_id>/points/export/",
+        "get",
+        "/api/students/2/points/export/",
+    ),
+    Benchmark(
+        "stats", "students/<int:student_id>/stats/", "get", "/api/students/2/stats/"
+    ),
+    Benchmark(
+        "prizes",
+        "students/<int:student_id>/prizes/",
+        "get",
+        "/api/students/2/prizes/",
+    ),
+    Benchmark(
+        "prizes-post",
+        "students/<int:student_id>/prizes/",
+        "post",
+        "/api/students/2/prizes/",
+        {"name": "Nagroda", "value": 10},
+    ),
+    Benchmark(
+        "prize",
+        "students/<int:student_id>/prize/<int:prize_id>/",
+        "get",
+        "/api/students/2/prize/2/",
+    ),
+    Benchmark(
+        "prize-patch",
+        "students/<int:student_id>/prize/<int:prize_id>/",
+        "patch",
+        "/api/students/2/prize/2/",
+        {"value": 30},
+    ),
+    Benchmark(
+        "prize-delete",
+        "students/<int:student_id>/prize/<int:prize_id>/",
+        "delete",
+        _new_prize_url,
+    ),
+    Benchmark(
+        "tasks",
+        "students/<int:student_id>/tasks/",
+        "get",
+        "/api/students/2/tasks/",
+    ),
+    Benchmark(
+        "tasks-post",
+        "students/<int:student_id>/tasks/",
+        "post",
+        "/api/students/2/tasks/",
+        {"name": "Zadanie", "value": 1},
+    ),
+    Benchmark(
+        "task",
+        "students/<int:student_id>/task/<int:task_id>/",
+        "get",
+        "/api/students/2/task/2/",
+    ),
+    Benchmark(
+        "task-patch",
+        "students/<int:student_id>/task/<int:task_id>/",
+        "patch",
+        "/api/students/2/task/2/",
+        {"value": 1},
+    ),
+    Benchmark(
+        "task-delete",
+        "students/<int:student_id>/task/<int:task_id>/",
+        "delete",
+        _new_task_url,
+    ),
+]
+
+
+@pytest.mark.benchmark
+class TestEndpointBenchmarks(EndpointTestCase):
+    """
+    Benchmarks of all endpoints, see module docstring.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.created = 0
+        self.token = self.access_token()
+        # 'cache-stats/' and 'metrics/' are available for staff only.
+        CustomUser.objects.filter(username="opiekun1").update(is_staff=True)
+
+    def resize(self, size: int) -> None:
+        """
+        Helper method to add data up to given size.
+        """
+        current = Role.objects.filter(caregiver_id=1).count()
+        self.add_students(size - current, f"benchmark{size}")
+        for model in (Task, Prize):
+            current = model.objects.filter(student_id=2).count()
+            model.objects.bulk_create(
+                model(student_id=2, name=f"{model.__name__} {index}", value=1)
+                for index in range(current, size)
+            )
+        point = Point.objects.filter(student_id=2).first()
+        current = Point.objects.filter(student_id=2).count()
+        Point.objects.bulk_create(
+            Point(
+                value=1,
+                assigner_id=1,
+                student_id=2,
+                points_type=point.points_type,
+                content_type_id=point.content_type_id,
+                object_id=point.object_id,
+                name=point.name,
+            )
+            for _ in range(current, size)
+        )
+
+    def prepare(self, benchmark: Benchmark) -> tuple[str, Any]:
+        """
+        Helper method to get URL and data of the next request of the benchmark.
+        """
+        url = benchmark.url(self) if callable(benchmark.url) else benchmark.url
+        data = benchmark.data(self) if callable(benchmark.data) else benchmark.data
+        cache.clear()
+        return url, data
+
+    def request(self, benchmark: Benchmark, url: str, data: Any) -> float:
+        """
+        Helper method to make a request of the benchmark and return its latency.
+        Streamed content is read.
+        """
+        start = time.perf_counter()
+        if benchmark.method in ("get", "delete"):
+            response = getattr(self, benchmark.method)(url, self.token)
+        else:
+            response = getattr(self, benchmark.method)(url, data, self.token)
+        if response.streaming:
+            b"".join(response.streaming_content)
+        latency = time.perf_counter() - start
+
+        assert response.status_code < 400, (benchmark.name, response.content)
+        return latency
+
+    def measure(self, benchmark: Benchmark) -> dict[str, float]:
+        """
+        Helper method to measure queries, latency and allocations of the benchmark.
+        """
+        # First request warms up imports and lazily prepared data.
+        self.request(benchmark, *self.prepare(benchmark))
+
+        request = self.prepare(benchmark)
+        with CaptureQueriesContext(connection) as queries:
+            self.request(benchmark, *request)
+        # Log of queries is reset by next requests.
+        query_count = len(queries)
+        if not TIMINGS:
+            return {"queries": query_count}
+
+        latencies = [
+            self.request(benchmark, *self.prepare(benchmark)) for _ in range(REPEAT)
+        ]
+
+        request = self.prepare(benchmark)
+        tracemalloc.start()
+        try:
+            self.request(benchmark, *request)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "queries": query_count,
+            "latency_ms": round(statistics.median(latencies) * 1000, 2),
+            "peak_kib": round(peak / 1024, 1),
+        }
+
+    def test_AllEndpoints(self):
+        routes = {str(pattern.pattern) for pattern in urls.urlpatterns}
+        assert routes == {benchmark.route for benchmark in BENCHMARKS}
+
+    def test_Budgets(self):
+        results = {benchmark.name: {} for benchmark in BENCHMARKS}
+        for size in SIZES:
+            self.resize(size)
+            for benchmark in BENCHMARKS:
+                results[benchmark.name][str(size)] = self.measure(benchmark)
+
+        if os.getenv("BENCHMARK_UPDATE"):
+            with open(BASELINE_PATH, "w") as baseline_file:
+                json.dump(results, baseline_file, indent=4, ensure_ascii=False)
+                baseline_file.write("\n")
+            return
+
+        with open(BASELINE_PATH) as baseline_file:
+            baseline = json.load(baseline_file)
+
+        failures = []
+        for name, sizes in results.items():
+            query_counts = {result["queries"] for result in sizes.values()}
+            if len(query_counts) > 1:
+                failures.append(
+                    f"{name}: queries depend on size {sorted(query_counts)}"
+                )
+            for size, result in sizes.items():
+                budget = baseline.get(name, {}).get(size)
+                if budget is None:
+                    failures.append(f"{name} [{size}]: no baseline")
+                    continue
+                if result["queries"] > budget["queries"]:
+                    failures.append(
+                        f"{name} [{size}]: {result['queries']} queries, "
+                        f"budget {budget['queries']}"
+                    )
+                if not TIMINGS:
+                    continue
+                latency_budget = (
+                    budget["latency_ms"] * LATENCY_TOLERANCE + LATENCY_MARGIN_MS
+                )
+                if result["latency_ms"] > latency_budget:
+                    failures.append(
+                        f"{name} [{size}]: {result['latency_ms']} ms, "
+                        f"budget {latency_budget:.2f} ms"
+                    )
+                allocations_budget = (
+                    budget["peak_kib"] * ALLOCATIONS_TOLERANCE + ALLOCATIONS_MARGIN_KIB
+                )
+                if result["peak_kib"] > allocations_budget:
+                    failures.append(
+                        f"{name} [{size}]: {result['peak_kib']} KiB, "
+                        f"budget {allocations_budget:.1f} KiB"
+                    )
+
+        assert not failures, "Budgets exceeded:\n" + "\n".join(failures)
@@ -0,0 +1,117 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from users.models import Point, Student, Task
+
+from .common import EndpointTestCase
+
+
+class TestBulkPointsPost(EndpointTestCase):
+    """
+    Tests for '/api/students/points/' POST endpoint.
+    """
+
+    VALID_URL = "/api/students/points/"
+
+    def test_Success(self):
+        data = [
+            {"student": 2, "content_type": "task", "object_id": 2},
+            {"student": 2, "content_type": "prize", "object_id": 2},
+        ]
+        response = self.post(self.VALID_URL, data)
+
+        # General assertions.
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.headers["Content-Type"] == "application/json"
+        response_json = response.json()
+        assert len(response_json) == 2
+
+        # Fixture specific assertions.
+        task_result, prize_result = response_json
+        assert task_result["status"] == status.HTTP_201_CREATED
+        assert task_result["point"]["value"] == 1
+        assert task_result["point"]["points_type"] == "task"
+        assert task_result["point"]["assigner"] == 1
+        assert prize_result["status"] == status.HTTP_201_CREATED
+        assert prize_result["point"]["value"] == 30
+        assert prize_result["point"]["points_type"] == "prize"
+        assert Student.objects.get(pk=2).total_points == 120 + 1 - 30
+
+    def test_PartialFailure(self):
+        data = [
+            # Not permitted student.
+            {"student": 1, "content_type": "task", "object_id": 1},
+            # Task of another student.
+            {"student": 2, "content_type": "task", "object_id": 1},
+            # Prize too expensive.
+            {"student": 2, "content_type": "prize", "object_id": 3},
+            {"student": 2, "content_type": "task", "object_id": 2},
+        ]
+        response = self.post(self.VALID_URL, data)
+
+        assert response.status_code == status.HTTP_207_MULTI_STATUS
+        results = [result["status"] for result in response.json()]
+        assert results == [
+            status.HTTP_404_NOT_FOUND,
+            status.HTTP_404_NOT_FOUND,
+            status.HTTP_400_BAD_REQUEST,
+            status.HTTP_201_CREATED,
+        ]
+        assert response.json()[2]["errors"] == {
+            "total_points": ["Ensure this value is greater than or equal to 0."]
+        }
+        assert Student.objects.get(pk=1).total_points == 250
+        assert Student.objects.get(pk=2).total_points == 121
+
+    def test_AllFailed(self):
+        data = [{"student": 12345, "content_type": "task", "object_id": 2}]
+        response = self.post(self.VALID_URL, data)
+
+        assert response.status_code == status.HTTP_207_MULTI_STATUS
+        assert response.json()[0]["status"] == status.HTTP_404_NOT_FOUND
+
+    def test_ConstantQueries(self):
+        token = self.access_token()
+        query_counts = []
+        for count in (1, 10, 30):
+            tasks = [
+                Task.objects.create(student=student, name="task", value=3)
+                for student in self.add_students(count, f"bulk{count}")
+            ]
+            data = [
+                {
+                    "student": task.student_id,
+                    "content_type": "task",
+                    "object_id": task.pk,
+                }
+                for task in tasks
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.post(self.VALID_URL, data, token)
+            assert response.status_code == status.HTTP_201_CREATED
+            query_counts.append(len(queries))
+
+        assert len(set(query_counts)) == 1
+        assert Point.objects.filter(student__user__username__startswith="bulk").count()
+        assert set(
+            Student.objects.filter(user__username__startswith="bulk").values_list(
+                "total_points", flat=True
+            )
+        ) == {3}
+
+    def test_InvalidData(self):
+        response = self.post(self.VALID_URL, [{"student": 2, "content_type": "asdf"}])
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_Empty(self):
+        response = self.post(self.VALID_URL, [])
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_NoToken(self):
+        response = self.client.post(self.VALID_URL, [], format="json")
+        self.assert_no_token(response)
+
+    def test_InvalidToken(self):
+        response = self.post(self.VALID_URL, [], self.bogus_token())
+        self.assert_invalid_token(response)
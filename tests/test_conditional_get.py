@@ -0,0 +1,139 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from users.models import Point, Task
+
+from .common import EndpointTestCase
+
+
+class TestConditionalGet(EndpointTestCase):
+    """
+    Tests for 'ETag' and 'If-None-Match' support of student resources.
+    """
+
+    URLS = [
+        "/api/students/",
+        "/api/students/2/",
+        "/api/students/2/tasks/",
+        "/api/students/2/task/2/",
+        "/api/students/2/prizes/",
+        "/api/students/2/prize/2/",
+        "/api/students/2/points/",
+    ]
+
+    def conditional_get(self, endpoint_url: str, etag: str, token: str):
+        """
+        Helper method to make a GET request with 'If-None-Match' header.
+        """
+        return self.client.get(
+            endpoint_url,
+            HTTP_AUTHORIZATION=f"Bearer {token}",
+            HTTP_IF_NONE_MATCH=etag,
+        )
+
+    def test_NotModified(self):
+        token = self.access_token()
+        for url in self.URLS:
+            response = self.get(url, token)
+            assert response.status_code == status.HTTP_200_OK
+            etag = response.headers["ETag"]
+
+            response = self.conditional_get(url, etag, token)
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED, url
+            assert response.headers["ETag"] == etag
+            assert response.content == b""
+
+    def test_NotModifiedSkipsMainQuery(self):
+        token = self.access_token()
+        etag = self.get("/api/students/2/tasks/", token).headers["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.conditional_get("/api/students/2/tasks/", etag, token)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert not any(Task._meta.db_table in query["sql"] for query in queries)
+
+    def test_ModifiedByTask(self):
+        token = self.access_token()
+        etag = self.get("/api/students/2/tasks/", token).headers["ETag"]
+        self.post("/api/students/2/tasks/", {"name": "Nowe", "value": 2}, token)
+
+        response = self.conditional_get("/api/students/2/tasks/", etag, token)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+        assert len(response.json()) == 2
+
+    def test_ModifiedByPoint(self):
+        token = self.access_token()
+        etag = self.get("/api/students/2/", token).headers["ETag"]
+        self.post(
+            "/api/students/2/points/", {"content_type": "task", "object_id": 2}, token
+        )
+
+        response = self.conditional_get("/api/students/2/", etag, token)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["total_points"] == 121
+
+    def test_NotModifiedByPoint(self):
+        token = self.access_token()
+        urls = ["/api/students/2/tasks/", "/api/students/2/prizes/"]
+        etags = [self.get(url, token).headers["ETag"] for url in urls]
+        self.post(
+            "/api/students/2/points/", {"content_type": "task", "object_id": 2}, token
+        )
+
+        for url, etag in zip(urls, etags):
+            response = self.conditional_get(url, etag, token)
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED, url
+
+    def test_ModifiedByBulkPoints(self):
+        token = self.access_token()
+        etag = self.get("/api/students/", token).headers["ETag"]
+        self.post(
+            "/api/students/points/",
+            [{"student": 2, "content_type": "task", "object_id": 2}],
+            token,
+        )
+
+        response = self.conditional_get("/api/students/", etag, token)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_ModifiedByStudent(self):
+        token = self.access_token()
+        etag = self.get("/api/students/2/", token).headers["ETag"]
+        self.patch("/api/students/2/", {"first_name": "Nowe"}, token)
+
+        response = self.conditional_get("/api/students/2/", etag, token)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["first_name"] == "Nowe"
+
+    def test_ModifiedByPointDeletion(self):
+        token = self.access_token()
+        etag = self.get("/api/students/2/points/", token).headers["ETag"]
+        Point.objects.filter(student_id=2).first().delete()
+
+        response = self.conditional_get("/api/students/2/points/", etag, token)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_ModifiedByNewStudent(self):
+        token = self.access_token()
+        etag = self.get("/api/students/", token).headers["ETag"]
+        student_data = {
+            "email": "nowy@example.com",
+            "username": "nowy",
+            "first_name": "Nowy",
+            "last_name": "Uczeń",
+            "total_points": 0,
+        }
+        self.post("/api/students/", student_data, token)
+
+        response = self.conditional_get("/api/students/", etag, token)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_Forbidden(self):
+        token = self.access_token()
+        etag = self.get("/api/students/2/", token).headers["ETag"]
+
+        response = self.conditional_get("/api/students/1/", etag, token)
+        self.assert_not_found(response)
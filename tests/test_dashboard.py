@@ -0,0 +1,75 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from users.models import Task
+
+from .common import EndpointTestCase
+
+
+class TestDashboardGet(EndpointTestCase):
+    """
+    Tests for '/api/dashboard/' GET endpoint.
+    """
+
+    VALID_URL = "/api/dashboard/"
+
+    def test_Success(self):
+        token = self.access_token()
+        response = self.get(self.VALID_URL, token)
+
+        # General assertions.
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["Content-Type"] == "application/json"
+
+        # Same data as returned by endpoints of students, tasks, prizes and points.
+        (student,) = response.json()
+        tasks = student.pop("tasks")
+        prizes = student.pop("prizes")
+        points = student.pop("points")
+        assert [student] == self.get("/api/students/", token).json()
+        assert tasks == self.get("/api/students/2/tasks/", token).json()
+        assert prizes == self.get("/api/students/2/prizes/", token).json()
+        assert points == self.get("/api/students/2/points/", token).json()[:5]
+
+    def test_PointsLimit(self):
+        token = self.access_token()
+        self.post(
+            "/api/students/points/",
+            [{"student": 2, "content_type": "task", "object_id": 2}] * 5,
+            token,
+        )
+
+        response = self.get(f"{self.VALID_URL}?points=3", token)
+
+        assert response.status_code == status.HTTP_200_OK
+        latest_points = self.get("/api/students/2/points/", token).json()[:3]
+        assert response.json()[0]["points"] == latest_points
+
+    def test_InvalidPointsLimit(self):
+        token = self.access_token()
+        for limit in ("0", "51", "abc"):
+            response = self.get(f"{self.VALID_URL}?points={limit}", token)
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_ConstantQueries(self):
+        token = self.access_token()
+        query_counts = []
+        for prefix in ("few", "many"):
+            for student in self.add_students(5, prefix):
+                Task.objects.create(student=student, name="task", value=3)
+            with self.assertNoQueryProblems(), CaptureQueriesContext(connection) as q:
+                response = self.get(self.VALID_URL, token)
+            assert response.status_code == status.HTTP_200_OK
+            query_counts.append(len(q))
+
+        assert len(response.json()) == 11
+        assert query_counts[0] == query_counts[1]
+
+    def test_NoToken(self):
+        response = self.client.get(self.VALID_URL)
+        self.assert_no_token(response)
+
+    def test_InvalidToken(self):
+        response = self.get(self.VALID_URL, self.bogus_token())
+        self.assert_invalid_token(response)
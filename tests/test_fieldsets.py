@@ -0,0 +1,147 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from .common import EndpointTestCase
+
+
+class TestSparseFields(EndpointTestCase):
+    """
+    Tests for '?fields=' and '?include=' query parameters of GET endpoints.
+    """
+
+    def get_with_queries(self, url: str, token: str):
+        """
+        Helper method to make a GET request, return response and SQL of queries.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get(url, token)
+        return response, [query["sql"] for query in queries]
+
+    def test_Students(self):
+        token = self.access_token()
+        for url in ("/api/students/", "/api/students/2/"):
+            full = self.get(url, token).json()
+            response, queries = self.get_with_queries(
+                f"{url}?fields=total_points,pk", token
+            )
+
+            assert response.status_code == status.HTTP_200_OK
+            # Fields are returned in order of declaration.
+            expected = full if isinstance(full, list) else [full]
+            output = response.json()
+            output = output if isinstance(output, list) else [output]
+            assert [list(entry) for entry in output] == [["pk", "total_points"]] * len(
+                expected
+            )
+            assert [entry["total_points"] for entry in output] == [
+                entry["total_points"] for entry in expected
+            ]
+            # Users aren't joined.
+            assert not any("users_customuser" in sql for sql in queries)
+
+    def test_UserFields(self):
+        token = self.access_token()
+        response, queries = self.get_with_queries(
+            "/api/students/2/?fields=username", token
+        )
+
+        assert response.json() == {"username": "student1"}
+        (sql,) = [sql for sql in queries if "users_customuser" in sql]
+        assert '"users_customuser"."username"' in sql
+        assert '"users_customuser"."email"' not in sql
+        assert '"students"."total_points"' not in sql
+
+    def test_ListsOfStudent(self):
+        token = self.access_token()
+        for url, field, column in (
+            ("/api/students/2/tasks/", "student", "student_id"),
+            ("/api/students/2/prizes/", "student", "student_id"),
+            ("/api/students/2/points/", "assignment_date", "assignment_date"),
+        ):
+            full = self.get(url, token).json()
+            response, queries = self.get_with_queries(f"{url}?fields=pk,{field}", token)
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json() == [
+                {"pk": entry["pk"], field: entry[field]} for entry in full
+            ]
+            (sql,) = [sql for sql in queries if f'"{column}"' in sql.split("FROM")[0]]
+            assert '"name"' not in sql.split("FROM")[0]
+
+    def test_PaginatedPoints(self):
+        token = self.access_token()
+        full = self.get("/api/students/2/points/?page_size=2", token).json()
+        response = self.get("/api/students/2/points/?page_size=2&fields=value", token)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["results"] == [
+            {"value": entry["value"]} for entry in full["results"]
+        ]
+        # Cursor of the next page is the same.
+        next_page = self.get(response.json()["next"], token).json()
+        full_next_page = self.get(full["next"], token).json()
+        assert next_page["results"] == [
+            {"value": entry["value"]} for entry in full_next_page["results"]
+        ]
+
+    def test_SingleTaskAndPrize(self):
+        token = self.access_token()
+        for url in ("/api/students/2/task/2/", "/api/students/2/prize/2/"):
+            full = self.get(url, token).json()
+            response = self.get(f"{url}?fields=name,value", token)
+
+            assert response.json() == {"name": full["name"], "value": full["value"]}
+
+    def test_Ranking(self):
+        token = self.access_token()
+        full = self.get("/api/students/ranking/", token).json()
+        response, queries = self.get_with_queries(
+            "/api/students/ranking/?fields=pk,rank", token
+        )
+
+        assert response.json() == [
+            {"pk": entry["pk"], "rank": entry["rank"]} for entry in full
+        ]
+        # Students only, access is cached.
+        assert len(queries) == 1
+
+    def test_DashboardInclude(self):
+        token = self.access_token()
+        full = self.get("/api/dashboard/", token).json()
+        response, queries = self.get_with_queries(
+            "/api/dashboard/?fields=pk,total_points&include=tasks", token
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [
+            {
+                "pk": entry["pk"],
+                "total_points": entry["total_points"],
+                "tasks": entry["tasks"],
+            }
+            for entry in full
+        ]
+        # Only tasks are prefetched.
+        assert any('FROM "student_tasks"' in sql for sql in queries)
+        assert not any('FROM "student_prizes"' in sql for sql in queries)
+        assert not any('FROM "student_points"' in sql for sql in queries)
+
+        response = self.get("/api/dashboard/?include=", token)
+        assert [list(entry) for entry in response.json()] == [
+            ["pk", "email", "username", "first_name", "last_name", "total_points"]
+        ] * len(full)
+
+    def test_InvalidFields(self):
+        token = self.access_token()
+        for url in (
+            "/api/students/?fields=pk,password",
+            "/api/students/2/?fields=",
+            "/api/students/2/tasks/?fields=points",
+            "/api/students/2/points/?fields=pk&include=tasks",
+            "/api/dashboard/?include=stats",
+            "/api/dashboard/?fields=tasks",
+        ):
+            with self.subTest(url=url):
+                response = self.get(url, token)
+                assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,89 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count, Q, Sum
+from rest_framework import status
+
+from users.models import Caregiver, CustomUser, DailyPoints, Point, Student
+
+from .common import EndpointTestCase
+
+
+class TestGenerateData(EndpointTestCase):
+    """
+    Tests for 'generate_data' command.
+    """
+
+    def generate(self, **options):
+        """
+        Helper method to generate a small data set with 'test' prefix.
+        """
+        options = {"caregivers": 5, "days": 14, "batch_size": 2, **options}
+        call_command("generate_data", prefix="test", stdout=StringIO(), **options)
+
+    def test_Counts(self):
+        self.generate()
+
+        caregivers = Caregiver.objects.filter(user__username__startswith="test_")
+        students = Student.objects.filter(user__username__startswith="test_")
+        assert caregivers.count() == 5
+        assert caregivers.filter(role__isnull=True).count() == 0
+        assert students.filter(role__isnull=True).count() == 0
+        assert students.annotate(tasks=Count("task")).filter(tasks=8).count() == (
+            students.count()
+        )
+        assert Point.objects.filter(student__in=students).exists()
+
+    def test_TotalPoints(self):
+        self.generate()
+
+        students = Student.objects.filter(user__username__startswith="test_").annotate(
+            tasks=Sum("point__value", filter=Q(point__points_type=Point.TASK_TYPE)),
+            prizes=Sum("point__value", filter=Q(point__points_type=Point.PRIZE_TYPE)),
+        )
+        for student in students:
+            assert student.total_points == (student.tasks or 0) - (student.prizes or 0)
+            assert student.total_points >= 0
+
+    def test_DailyPoints(self):
+        self.generate()
+        generated = set(DailyPoints.objects.values_list())
+
+        call_command("rebuild_daily_points", stdout=StringIO())
+        rebuilt = set(DailyPoints.objects.values_list())
+        assert {row[1:] for row in generated} == {row[1:] for row in rebuilt}
+
+    def test_Deterministic(self):
+        self.generate(seed=7)
+        first = list(
+            Point.objects.filter(student__user__username__startswith="test_")
+            .order_by("pk")
+            .values_list("value", "points_type", "assignment_date")
+        )
+        CustomUser.objects.filter(username__startswith="test_").delete()
+
+        self.generate(seed=7)
+        second = list(
+            Point.objects.filter(student__user__username__startswith="test_")
+            .order_by("pk")
+            .values_list("value", "points_type", "assignment_date")
+        )
+        assert first == second
+
+    def test_Login(self):
+        self.generate(caregivers=1)
+
+        response = self.client.post(
+            "/api/token-auth/", {"username": "test_caregiver_0", "password": "zeton"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        response = self.get("/api/students/", response.json()["access"])
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()) >= 1
+
+    def test_ExistingPrefix(self):
+        self.generate(caregivers=1)
+        with pytest.raises(CommandError):
+            self.generate(caregivers=1)
@@ -1,6 +1,11 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
+
+from users.models import Point, Prize, Task
+
 from .common import EndpointTestCase
-from django.contrib.contenttypes.models import ContentType
 
 
 class TestPointsGet(EndpointTestCase):
@@ -35,6 +40,7 @@ class TestPointsGet(EndpointTestCase):
             expected_points_type,
             expected_content_type,
             expected_object_id,
+            expected_name,
         ):
             assert recv_point["pk"] == expected_pk
             assert recv_point["value"] == expected_value
@@ -44,6 +50,7 @@ class TestPointsGet(EndpointTestCase):
             assert recv_point["points_type"] == expected_points_type
             assert recv_point["content_type"] == expected_content_type
             assert recv_point["object_id"] == expected_object_id
+            assert recv_point["name"] == expected_name
 
         # Only first two entries are now tested.
         assert_entry(
@@ -55,6 +62,7 @@ class TestPointsGet(EndpointTestCase):
             expected_points_type="task",
             expected_content_type=10,
             expected_object_id=2,
+            expected_name="Podlanie kwiatów",
         )
         assert_entry(
             response_json[1],
@@ -65,8 +73,78 @@ class TestPointsGet(EndpointTestCase):
             expected_points_type="prize",
             expected_content_type=11,
             expected_object_id=2,
+            expected_name="1 godzina na basenie",
         )
 
+    def test_SourceChanged(self):
+        # Renamed or removed sources don't affect points history.
+        Task.objects.filter(pk=2).update(name="Renamed")
+        Prize.objects.filter(pk=2).delete()
+        response = self.get(self.VALID_URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        names = {entry["name"] for entry in response.json()}
+        assert names == {"Podlanie kwiatów", "1 godzina na basenie"}
+
+    def test_Paginated(self):
+        # Walk through all pages, one entry per page.
+        all_pks = [entry["pk"] for entry in self.get(self.VALID_URL).json()]
+        pks = []
+        url = f"{self.VALID_URL}?page_size=1"
+        while url is not None:
+            response = self.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            response_json = response.json()
+            assert len(response_json["results"]) == 1
+            pks.append(response_json["results"][0]["pk"])
+            url = response_json["next"]
+
+        assert pks == all_pks
+
+    def test_PaginatedSameDate(self):
+        # Points added at once share a timestamp, pages are positioned by
+        # '(assignment_date, id)' instead of an offset.
+        point = Point.objects.filter(student_id=2).first()
+        Point.objects.bulk_create(
+            Point(
+                value=index,
+                assigner_id=point.assigner_id,
+                student_id=2,
+                points_type=point.points_type,
+                content_type_id=point.content_type_id,
+                object_id=point.object_id,
+                name=f"Punkty {index}",
+            )
+            for index in range(10)
+        )
+        Point.objects.filter(student_id=2).update(assignment_date=point.assignment_date)
+        all_pks = [entry["pk"] for entry in self.get(self.VALID_URL).json()]
+
+        pages = []
+        url = f"{self.VALID_URL}?page_size=3"
+        while url is not None:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert not any("OFFSET" in query["sql"] for query in queries)
+            response_json = response.json()
+            pages.append([entry["pk"] for entry in response_json["results"]])
+            url = response_json["next"]
+        assert sum(pages, []) == all_pks
+
+        # Walk back from the last page.
+        url = response_json["previous"]
+        for page in reversed(pages[:-1]):
+            response_json = self.get(url).json()
+            assert [entry["pk"] for entry in response_json["results"]] == page
+            url = response_json["previous"]
+        assert url is None
+
+    def test_PaginatedInvalidCursor(self):
+        response = self.get(f"{self.VALID_URL}?page_size=1&cursor=cD1bIngiXQ==")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()["detail"] == "Invalid cursor"
+
     def test_Forbidden(self):
         response = self.get(self.NOT_PERMITTED_URL)
         self.assert_not_found(response)
@@ -135,6 +213,9 @@ class TestPointsPost(EndpointTestCase):
         assert student_points - response_json["value"] == total_points
 
     def test_Prize_NegativePoints(self):
+        student_points = self._get_student_points(2)
+        points_count = Point.objects.filter(student_id=2).count()
+
         # Access API.
         prize_data = {"content_type": "prize", "object_id": "3"}
         response = self.post(self.VALID_URL, prize_data)
@@ -149,6 +230,10 @@ class TestPointsPost(EndpointTestCase):
             "Ensure this value is greater than or equal to 0."
         ]
 
+        # Neither total points nor points history should change.
+        assert self._get_student_points(2) == student_points
+        assert Point.objects.filter(student_id=2).count() == points_count
+
     def test_Task_Success(self):
         student_points = self._get_student_points(2)
         response = self.post(self.VALID_URL, self.VALID_POST_TASK)
@@ -164,14 +249,40 @@ class TestPointsPost(EndpointTestCase):
         assert response_json["assigner"] == 1
         assert response_json["points_type"] == "task"
         assert response_json["content_type"] == ContentType.objects.get(model="task").pk
+        assert response_json["name"] == student_task["name"]
+        assert Point.objects.get(pk=response_json["pk"]).task_id == student_task["pk"]
 
         total_points = self._get_student_points(2)
         assert student_points + response_json["value"] == total_points
 
+    def test_NoContentTypeLookup(self):
+        token = self.access_token()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post(self.VALID_URL, self.VALID_POST_TASK, token)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        content_types_table = connection.ops.quote_name("django_content_type")
+        assert not any(content_types_table in query["sql"] for query in queries)
+
     def test_InvalidType(self):
         response = self.post(self.VALID_URL, self.INVALID_POST_TYPE)
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
+    def test_InvalidObjectId(self):
+        for data in (
+            {"content_type": "task", "object_id": "abc"},
+            {"content_type": "task"},
+            {"object_id": "2"},
+        ):
+            response = self.post(self.VALID_URL, data)
+            assert response.status_code == status.HTTP_400_BAD_REQUEST, data
+
+    def test_ObjectNotFound(self):
+        # Task of another student.
+        task_data = {"content_type": "task", "object_id": "1"}
+        response = self.post(self.VALID_URL, task_data)
+        self.assert_not_found(response)
+
     def test_Forbidden(self):
         response = self.post(self.NOT_PERMITTED_URL, self.VALID_POST_PRIZE)
         self.assert_not_found(response)
@@ -0,0 +1,119 @@
+import csv
+import io
+import json
+
+from asgiref.sync import sync_to_async
+from django.test import AsyncRequestFactory
+from rest_framework import status
+
+from users.models import Point
+from users.async_views import AsyncPointsExportResource
+from users.views import PointsExportResource
+
+from .common import EndpointTestCase
+
+
+class TestPointsExportGet(EndpointTestCase):
+    """
+    Tests for '/api/students/<int:student_id>/points/export/' GET endpoint.
+    """
+
+    VALID_URL = "/api/students/2/points/export/"
+    NOT_PERMITTED_URL = "/api/students/1/points/export/"
+
+    def _add_points(self, count: int) -> None:
+        """
+        Helper method to add points to student with ID 2.
+        """
+        point = Point.objects.filter(student_id=2).first()
+        Point.objects.bulk_create(
+            Point(
+                value=index,
+                assigner_id=point.assigner_id,
+                student_id=2,
+                points_type=point.points_type,
+                content_type_id=point.content_type_id,
+                object_id=point.object_id,
+                name=f"Punkty {index}",
+            )
+            for index in range(count)
+        )
+
+    def test_CSV(self):
+        token = self.access_token()
+        response = self.get(self.VALID_URL, token)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response.headers["Content-Type"] == "text/csv; charset=utf-8"
+        assert response.headers["Content-Disposition"] == (
+            'attachment; filename="student_2_points.csv"'
+        )
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        points = self.get("/api/students/2/points/", token).json()
+        assert rows == [
+            {key: "" if value is None else str(value) for key, value in item.items()}
+            for item in points
+        ]
+
+    def test_CSVFormula(self):
+        Point.objects.filter(student_id=2).update(name="=HYPERLINK(A1)")
+        Point.objects.filter(pk=11).update(name="-1+1")
+        response = self.get(self.VALID_URL)
+
+        content = b"".join(response.streaming_content).decode()
+        names = {row["pk"]: row["name"] for row in csv.DictReader(io.StringIO(content))}
+        assert names.pop("11") == "'-1+1"
+        assert set(names.values()) == {"'=HYPERLINK(A1)"}
+
+    def test_NDJSON(self):
+        token = self.access_token()
+        response = self.get(f"{self.VALID_URL}?file_format=ndjson", token)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["Content-Type"] == "application/x-ndjson"
+        lines = b"".join(response.streaming_content).splitlines()
+        points = self.get("/api/students/2/points/", token).json()
+        assert [json.loads(line) for line in lines] == points
+
+    def test_Batches(self):
+        self._add_points(PointsExportResource.BATCH_SIZE * 2 + 1)
+        response = self.get(f"{self.VALID_URL}?file_format=ndjson")
+
+        parts = list(response.streaming_content)
+        # Empty header, two full batches and the rest.
+        assert len(parts) == 4
+        assert (
+            sum(part.count(b"\n") for part in parts)
+            == Point.objects.filter(student_id=2).count()
+        )
+
+    async def test_ASGI(self):
+        token = await sync_to_async(self.access_token)()
+        request = AsyncRequestFactory().get(
+            f"{self.VALID_URL}?file_format=ndjson",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        response = await AsyncPointsExportResource.as_view()(request, student_id=2)
+
+        assert response.is_async
+        lines = b"".join([part async for part in response]).splitlines()
+        points = await sync_to_async(self.get)("/api/students/2/points/", token)
+        assert [json.loads(line) for line in lines] == points.json()
+
+    def test_InvalidFormat(self):
+        response = self.get(f"{self.VALID_URL}?file_format=xml")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_NotPermitted(self):
+        response = self.get(self.NOT_PERMITTED_URL)
+        self.assert_not_found(response)
+
+    def test_NoToken(self):
+        response = self.client.get(self.VALID_URL)
+        self.assert_no_token(response)
+
+    def test_InvalidToken(self):
+        response = self.get(self.VALID_URL, self.bogus_token())
+        self.assert_invalid_token(response)
@@ -0,0 +1,123 @@
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.test import override_settings
+from rest_framework import status
+
+from users.models import CustomUser
+from zeton_backend import profiling
+
+from .common import EndpointTestCase
+
+TASKS_ROUTE = "api/students/<int:student_id>/tasks/"
+
+
+@override_settings(
+    MIDDLEWARE=["zeton_backend.profiling.ProfilingMiddleware", *settings.MIDDLEWARE],
+    PROFILING=True,
+    PROFILING_SAMPLE_RATE=1.0,
+)
+class TestProfiling(EndpointTestCase):
+    """
+    Tests for profiling middleware and metrics endpoint.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.token = self.access_token()
+        CustomUser.objects.filter(username="opiekun1").update(is_staff=True)
+        profiling.reset()
+
+    def tearDown(self):
+        profiling.reset()
+
+    def routes(self) -> dict[tuple[str, str], dict]:
+        """
+        Helper method to get metrics of profiled routes.
+        """
+        response = self.get("/api/metrics/", self.token)
+        assert response.status_code == status.HTTP_200_OK
+        return {
+            (route["method"], route["route"]): route
+            for route in response.json()["routes"]
+        }
+
+    def test_Recorded(self):
+        self.get("/api/students/2/tasks/", self.token)
+        self.get("/api/students/2/tasks/", self.token)
+        self.post("/api/students/2/tasks/", {"name": "Nowe", "value": 1}, self.token)
+
+        routes = self.routes()
+        metrics = routes[("GET", TASKS_ROUTE)]
+        for metric in profiling.METRICS:
+            assert metrics[metric]["count"] == 2
+            assert metrics[metric]["buckets"]["+Inf"] == 2
+        assert metrics["queries"]["sum"] > 0
+        assert metrics["sql_ms"]["sum"] > 0
+        assert metrics["serialize_ms"]["sum"] > 0
+        assert metrics["render_ms"]["sum"] > 0
+        assert metrics["duration_ms"]["sum"] >= sum(
+            metrics[metric]["sum"]
+            for metric in ("sql_ms", "serialize_ms", "view_ms", "render_ms")
+        )
+        assert routes[("POST", TASKS_ROUTE)]["duration_ms"]["count"] == 1
+
+    def test_Prometheus(self):
+        self.get("/api/students/2/tasks/", self.token)
+
+        response = self.get("/api/metrics/?format=prometheus", self.token)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["Content-Type"] == "text/plain; charset=utf-8"
+        lines = response.content.decode().splitlines()
+        assert "# TYPE zeton_request_duration_ms histogram" in lines
+        labels = f'method="GET",route="{TASKS_ROUTE}"'
+        assert f"zeton_request_queries_count{{{labels}}} 1" in lines
+        assert f'zeton_request_queries_bucket{{{labels},le="+Inf"}} 1' in lines
+
+    async def test_Async(self):
+        async def get_response(request):
+            pass
+
+        assert iscoroutinefunction(profiling.ProfilingMiddleware(get_response))
+        response = await self.async_client.get(
+            "/api/students/2/tasks/", headers={"Authorization": f"Bearer {self.token}"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        metrics = (await sync_to_async(self.routes)())[("GET", TASKS_ROUTE)]
+        assert metrics["duration_ms"]["count"] == 1
+        assert metrics["queries"]["sum"] > 0
+        # CPU time of a thread shared by requests isn't measured.
+        assert metrics["cpu_ms"]["count"] == 0
+
+    @override_settings(PROFILING_SAMPLE_RATE=0.0)
+    def test_NotSampled(self):
+        self.get("/api/students/2/tasks/", self.token)
+
+        assert self.routes() == {}
+
+    def test_NotFound(self):
+        self.get("/api/unknown/", self.token)
+
+        assert self.routes() == {}
+
+    def test_Forbidden(self):
+        CustomUser.objects.filter(username="opiekun1").update(is_staff=False)
+
+        response = self.get("/api/metrics/", self.token)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+        response = self.get("/api/metrics/?format=prometheus", self.token)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_Histogram():
+    histogram = profiling.Histogram((1, 10))
+    for value in (0.5, 1, 5, 20):
+        histogram.observe(value)
+
+    assert histogram.as_dict() == {
+        "count": 4,
+        "sum": 26.5,
+        "buckets": {"1": 2, "10": 3, "+Inf": 4},
+    }
@@ -0,0 +1,140 @@
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connection
+from django.test import override_settings
+
+from users.models import Prize, Task
+from zeton_backend.query_detector import (
+    QueryDetector,
+    QueryDetectorMiddleware,
+    QueryProblemsError,
+    fingerprint,
+)
+
+from .common import EndpointTestCase
+
+
+def test_Fingerprint():
+    assert fingerprint(
+        "SELECT * FROM tasks WHERE id IN (%s, %s,%s)  AND name = 'a''b' LIMIT 21"
+    ) == fingerprint("SELECT * FROM tasks WHERE id IN (%s) AND name = 'c' LIMIT 1")
+    assert fingerprint('SAVEPOINT "s140_x1"') == 'SAVEPOINT "s140_x1"'
+
+
+class TestQueryDetector(EndpointTestCase):
+    """
+    Tests for detector of duplicated, N+1 and slow queries.
+    """
+
+    def detect(self, detector: QueryDetector, *querysets) -> list[str]:
+        """
+        Helper method to evaluate querysets and return kinds of found problems.
+        """
+        with connection.execute_wrapper(detector):
+            for queryset in querysets:
+                list(queryset)
+        return [problem.kind for problem in detector.problems()]
+
+    def test_Duplicated(self):
+        detector = QueryDetector(slow_ms=1000)
+        kinds = self.detect(
+            detector, Task.objects.filter(pk=2), Task.objects.filter(pk=2)
+        )
+
+        assert kinds == ["Duplicated query"]
+        problem = detector.problems()[0]
+        assert problem.count == 2
+        assert problem.caller.startswith("tests/test_query_detector.py:")
+
+    def test_NPlusOne(self):
+        detector = QueryDetector(slow_ms=1000)
+        kinds = self.detect(
+            detector, *(Task.objects.filter(pk=pk) for pk in range(1, 4))
+        )
+
+        assert kinds == ["N+1 queries"]
+
+    def test_Slow(self):
+        kinds = self.detect(QueryDetector(slow_ms=0), Task.objects.all())
+
+        assert kinds == ["Slow query"]
+
+    def test_Endpoints(self):
+        self.add_students(5, "detector")
+        for index in range(5):
+            Task.objects.create(student_id=2, name=f"Zadanie {index}", value=1)
+            Prize.objects.create(student_id=2, name=f"Nagroda {index}", value=1)
+        token = self.access_token()
+        self.post(
+            "/api/students/points/",
+            [{"student": 2, "content_type": "task", "object_id": 2}] * 5,
+            token,
+        )
+
+        for url in [
+            "/api/current-user/",
+            "/api/students/",
+            "/api/students/2/",
+            "/api/students/2/points/",
+            "/api/students/2/points/export/",
+            "/api/students/2/stats/",
+            "/api/students/2/prizes/",
+            "/api/students/2/prize/2/",
+            "/api/students/2/tasks/",
+            "/api/students/2/task/2/",
+        ]:
+            with self.subTest(url=url), self.assertNoQueryProblems(slow_ms=1000):
+                response = self.get(url, token)
+                if response.streaming:
+                    b"".join(response.streaming_content)
+
+    def test_AssertNoQueryProblems(self):
+        with self.assertRaises(AssertionError):
+            with self.assertNoQueryProblems():
+                for pk in range(1, 4):
+                    Task.objects.filter(pk=pk).exists()
+
+
+@override_settings(
+    MIDDLEWARE=[
+        *settings.MIDDLEWARE,
+        "zeton_backend.query_detector.QueryDetectorMiddleware",
+    ]
+)
+class TestQueryDetectorMiddleware(EndpointTestCase):
+    """
+    Tests for middleware logging query problems of requests.
+    """
+
+    def test_Logged(self):
+        token = self.access_token()
+        with (
+            override_settings(QUERY_DETECTOR_SLOW_MS=0),
+            self.assertLogs("zeton_backend.query_detector", "WARNING") as logs,
+        ):
+            self.get("/api/students/2/tasks/", token)
+
+        assert logs.output
+        assert all("GET tasks-resource: Slow query" in line for line in logs.output)
+
+    async def test_Async(self):
+        async def get_response(request):
+            pass
+
+        assert iscoroutinefunction(QueryDetectorMiddleware(get_response))
+        token = await sync_to_async(self.access_token)()
+        with (
+            override_settings(QUERY_DETECTOR_SLOW_MS=0),
+            self.assertLogs("zeton_backend.query_detector", "WARNING") as logs,
+        ):
+            await self.async_client.get(
+                "/api/students/2/tasks/", headers={"Authorization": f"Bearer {token}"}
+            )
+
+        assert logs.output
+
+    def test_Raised(self):
+        token = self.access_token()
+        with override_settings(QUERY_DETECTOR_SLOW_MS=0, QUERY_DETECTOR_RAISE=True):
+            with self.assertRaises(QueryProblemsError):
+                self.get("/api/students/2/tasks/", token)
@@ -0,0 +1,82 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from users.models import Point, Prize, Task
+
+from .common import EndpointTestCase
+
+
+@skipUnless(connection.vendor == "postgresql", "Query plans of PostgreSQL only.")
+class TestQueryPlans(EndpointTestCase):
+    """
+    Queries of endpoints must not scan whole tables.
+
+    Plans are captured with sequential scans disabled, so the planner uses
+    an index whenever a matching one exists, regardless of table sizes.
+    """
+
+    URLS = [
+        "/api/dashboard/",
+        "/api/students/",
+        "/api/students/2/",
+        "/api/students/2/tasks/",
+        "/api/students/2/tasks/?page_size=10",
+        "/api/students/2/task/2/",
+        "/api/students/2/prizes/",
+        "/api/students/2/prizes/?page_size=10",
+        "/api/students/2/prize/2/",
+        "/api/students/2/points/",
+        "/api/students/2/points/?page_size=10",
+        "/api/students/2/stats/",
+        "/api/students/ranking/",
+        "/api/students/2/rank/",
+    ]
+
+    # Number of seeded students.
+    STUDENTS = 50
+
+    def setUp(self):
+        super().setUp()
+        students = self.add_students(self.STUDENTS, "plan")
+        for model in (Task, Prize):
+            model.objects.bulk_create(
+                model(student=student, name=f"{model.__name__} {index}", value=1)
+                for student in students
+                for index in range(5)
+            )
+        point = Point.objects.first()
+        Point.objects.bulk_create(
+            Point(
+                value=1,
+                assigner_id=1,
+                student=student,
+                points_type=point.points_type,
+                content_type_id=point.content_type_id,
+                object_id=point.object_id,
+            )
+            for student in students
+            for _ in range(10)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def test_NoSequentialScans(self):
+        token = self.access_token()
+        statements = []
+        for url in self.URLS:
+            # Log of queries is reset by each request.
+            with CaptureQueriesContext(connection) as queries:
+                assert self.get(url, token).status_code == status.HTTP_200_OK, url
+            statements.extend(query["sql"] for query in queries)
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            for sql in statements:
+                if not sql.startswith("SELECT"):
+                    continue
+                cursor.execute(f"EXPLAIN {sql}")
+                plan = "\n".join(row[0] for row in cursor.fetchall())
+                assert "Seq Scan" not in plan, f"{sql}\n{plan}"
@@ -0,0 +1,220 @@
+import json
+from unittest import skipUnless
+
+from django.core import serializers
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from users.models import Role, Student, Task
+
+from .common import EndpointTestCase
+
+
+class RankingTestCase(EndpointTestCase):
+    """
+    Common setup of ranking tests.
+    """
+
+    def setUp(self):
+        super().setUp()
+        # Fixture student 2 is assigned to current user, student 1 isn't.
+        self.fixture_points = Student.objects.get(pk=2).total_points
+        (self.first,) = self.add_students(
+            1, "first", total_points=self.fixture_points + 100
+        )
+        (self.tied,) = self.add_students(1, "tied", total_points=self.fixture_points)
+        (self.last,) = self.add_students(1, "last")
+
+
+@skipUnless(connection.vendor in ("postgresql", "sqlite"), "Query plans of a backend.")
+class TestRankingPlans(RankingTestCase):
+    """
+    Ranking queries must be read from 'role_ranking_idx', without sorting.
+    """
+
+    def test_IndexUsed(self):
+        token = self.access_token()
+        statements = []
+        for url in ("/api/students/ranking/", "/api/students/2/rank/"):
+            with CaptureQueriesContext(connection) as queries:
+                assert self.get(url, token).status_code == status.HTTP_200_OK
+            statements.extend(
+                query["sql"]
+                for query in queries
+                if 'ORDER BY "roles"."total_points"' in query["sql"]
+                or '"roles"."total_points" >' in query["sql"]
+            )
+        assert len(statements) == 2
+
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                # Tables are tiny, bitmap scans don't keep order of the index.
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                cursor.execute("SET LOCAL enable_bitmapscan = off")
+                explain, sort = "EXPLAIN", "Sort"
+            else:
+                explain, sort = "EXPLAIN QUERY PLAN", "TEMP B-TREE"
+            for sql in statements:
+                cursor.execute(f"{explain} {sql}")
+                plan = "\n".join(str(row[-1]) for row in cursor.fetchall())
+                assert "role_ranking_idx" in plan, f"{sql}\n{plan}"
+                assert sort not in plan, f"{sql}\n{plan}"
+
+
+class TestRankingGet(RankingTestCase):
+    """
+    Tests for '/api/students/ranking/' GET endpoint.
+    """
+
+    VALID_URL = "/api/students/ranking/"
+
+    def test_Success(self):
+        response = self.get(self.VALID_URL)
+
+        # General assertions.
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["Content-Type"] == "application/json"
+
+        # Ties share a rank and are ordered by ID.
+        ranking = [(entry["rank"], entry["pk"]) for entry in response.json()]
+        assert ranking == [
+            (1, self.first.pk),
+            (2, 2),
+            (2, self.tied.pk),
+            (4, self.last.pk),
+        ]
+        assert response.json()[0] == {
+            "pk": self.first.pk,
+            "email": "",
+            "username": "first_0",
+            "first_name": "",
+            "last_name": "",
+            "total_points": self.fixture_points + 100,
+            "rank": 1,
+        }
+
+    def test_Limit(self):
+        response = self.get(f"{self.VALID_URL}?limit=3")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [entry["rank"] for entry in response.json()] == [1, 2, 2]
+
+    def test_InvalidLimit(self):
+        token = self.access_token()
+        for limit in ("0", "101", "abc"):
+            response = self.get(f"{self.VALID_URL}?limit={limit}", token)
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_NoToken(self):
+        response = self.client.get(self.VALID_URL)
+        self.assert_no_token(response)
+
+    def test_InvalidToken(self):
+        response = self.get(self.VALID_URL, self.bogus_token())
+        self.assert_invalid_token(response)
+
+
+class TestRankGet(RankingTestCase):
+    """
+    Tests for '/api/students/<int:student_id>/rank/' GET endpoint.
+    """
+
+    # Fixture specific URL to available student data.
+    VALID_URL = "/api/students/2/rank/"
+    # Fixture specific URL to data not available for current user.
+    NOT_PERMITTED_URL = "/api/students/1/rank/"
+    # Fixture specific URL to invalid student ID.
+    NOT_FOUND_URL = "/api/students/12345/rank/"
+
+    def test_Success(self):
+        response = self.get(self.VALID_URL)
+
+        # General assertions.
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["Content-Type"] == "application/json"
+
+        assert response.json() == {
+            "pk": 2,
+            "rank": 2,
+            "total_points": self.fixture_points,
+            "students": 4,
+        }
+
+    def test_Last(self):
+        response = self.get(f"/api/students/{self.last.pk}/rank/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["rank"] == 4
+
+    def test_UpdatedByPoints(self):
+        token = self.access_token()
+        self.patch(
+            f"/api/students/{self.last.pk}/",
+            {"total_points": self.fixture_points + 200},
+            token,
+        )
+
+        response = self.get(f"/api/students/{self.last.pk}/rank/", token)
+        assert response.json()["rank"] == 1
+
+    def test_UpdatedByAwards(self):
+        token = self.access_token()
+        task = Task.objects.create(
+            student=self.last, name="Zadanie", value=self.fixture_points + 200
+        )
+        self.post(
+            f"/api/students/{self.last.pk}/points/",
+            {"content_type": "task", "object_id": task.pk},
+            token,
+        )
+        response = self.get(f"/api/students/{self.last.pk}/rank/", token)
+        assert response.json()["rank"] == 1
+
+        # Bulk awards.
+        task = Task.objects.create(
+            student_id=2, name="Zadanie", value=self.fixture_points + 300
+        )
+        self.post(
+            "/api/students/points/",
+            [{"student": 2, "content_type": "task", "object_id": task.pk}],
+            token,
+        )
+        response = self.get("/api/students/ranking/", token)
+        assert [entry["pk"] for entry in response.json()][:2] == [2, self.last.pk]
+
+    def test_LoadedFixtures(self):
+        # 'loaddata fixtures/*.json' loads roles before students.
+        fixtures = [
+            {
+                "model": "users.role",
+                "pk": 100,
+                "fields": {"role_name": "caregiver", "caregiver": 1, "student": 100},
+            },
+            {
+                "model": "users.student",
+                "pk": 100,
+                "fields": {"user": 100, "total_points": 7},
+            },
+            {"model": "users.customuser", "pk": 100, "fields": {"username": "loaded"}},
+        ]
+        for loaded in serializers.deserialize("json", json.dumps(fixtures)):
+            loaded.save()
+
+        assert Role.objects.get(pk=100).total_points == 7
+
+    def test_Forbidden(self):
+        response = self.get(self.NOT_PERMITTED_URL)
+        self.assert_not_found(response)
+
+    def test_NotFound(self):
+        response = self.get(self.NOT_FOUND_URL)
+        self.assert_not_found(response)
+
+    def test_NoToken(self):
+        response = self.client.get(self.VALID_URL)
+        self.assert_no_token(response)
+
+    def test_InvalidToken(self):
+        response = self.get(self.VALID_URL, self.bogus_token())
+        self.assert_invalid_token(response)
@@ -0,0 +1,93 @@
+import datetime
+import io
+from unittest import mock
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.views import APIView
+
+from zeton_backend.parsers import ORJSONParser
+from zeton_backend.renderers import ORJSONRenderer
+
+from .common import EndpointTestCase
+
+DATA = {
+    "utc": datetime.datetime(2024, 1, 2, 3, 4, 5, 678900, tzinfo=datetime.UTC),
+    "offset": datetime.datetime(2024, 7, 2, 3, 4, 5, tzinfo=ZoneInfo("Europe/Warsaw")),
+    "naive": datetime.datetime(2024, 1, 2, 3, 4, 5),
+    "date": datetime.date(2024, 1, 2),
+    "time": datetime.time(3, 4, 5, 6),
+    "decimal": Decimal("12.50"),
+    "lazy": gettext_lazy("Resource not found."),
+    "error": [ErrorDetail("Invalid value.", code="invalid")],
+    "unicode": "Podlanie kwiatów\u2028\u2029",
+    "nested": [{"pk": 1, "value": None, "flag": True}, (1.5, -2)],
+    1: "integer key",
+}
+
+
+class TestORJSONRenderer:
+    """
+    Tests for 'ORJSONRenderer'.
+    Output must be the same as output of 'JSONRenderer'.
+    """
+
+    def test_SameOutput(self):
+        assert ORJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+
+    def test_Empty(self):
+        assert ORJSONRenderer().render(None) == b""
+
+    def test_Indent(self):
+        media_type = "application/json; indent=4"
+        assert ORJSONRenderer().render(DATA, media_type) == JSONRenderer().render(
+            DATA, media_type
+        )
+
+
+class TestORJSONParser:
+    """
+    Tests for 'ORJSONParser'.
+    """
+
+    def test_SameResult(self):
+        content = '{"name": "Podlanie kwiatów", "value": [1, 2.5, null]}'.encode()
+        assert ORJSONParser().parse(io.BytesIO(content)) == JSONParser().parse(
+            io.BytesIO(content)
+        )
+
+    def test_Invalid(self):
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"name": '))
+
+    def test_NaN(self):
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"value": NaN}'))
+
+
+class TestORJSONEndpoints(EndpointTestCase):
+    """
+    Responses must not depend on the JSON renderer.
+    """
+
+    URLS = [
+        "/api/students/",
+        "/api/students/2/points/",
+        "/api/students/2/points/?page_size=2",
+        "/api/students/2/stats/",
+    ]
+
+    def test_SameResponses(self):
+        token = self.access_token()
+        for url in self.URLS:
+            response = self.get(url, token)
+            # Renderers of views are read from settings on import.
+            with mock.patch.object(APIView, "renderer_classes", [JSONRenderer]):
+                json_response = self.get(url, token)
+
+            assert response.content == json_response.content
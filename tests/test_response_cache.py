@@ -0,0 +1,94 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from users.models import CustomUser, Task
+
+from .common import EndpointTestCase
+
+
+class TestResponseCache(EndpointTestCase):
+    """
+    Tests for server-side cache of student resources.
+    """
+
+    URLS = [
+        "/api/students/2/",
+        "/api/students/2/tasks/",
+        "/api/students/2/prizes/",
+    ]
+
+    def stats(self, token: str) -> dict[str, int]:
+        """
+        Helper method to get response cache stats as a staff user.
+        """
+        CustomUser.objects.filter(username="opiekun1").update(is_staff=True)
+        return self.get("/api/cache-stats/", token).json()
+
+    def test_Hit(self):
+        token = self.access_token()
+        for url in self.URLS:
+            response = self.get(url, token)
+            cached_response = self.get(url, token)
+
+            assert cached_response.status_code == status.HTTP_200_OK
+            assert cached_response.headers["Content-Type"] == "application/json"
+            assert cached_response.headers["ETag"] == response.headers["ETag"]
+            assert cached_response.content == response.content
+
+        assert self.stats(token) == {"hits": 3, "misses": 3}
+
+    def test_HitSkipsMainQuery(self):
+        token = self.access_token()
+        self.get("/api/students/2/tasks/", token)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get("/api/students/2/tasks/", token)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not any(Task._meta.db_table in query["sql"] for query in queries)
+
+    def test_InvalidatedByTask(self):
+        token = self.access_token()
+        self.get("/api/students/2/tasks/", token)
+        Task.objects.create(student_id=2, name="Nowe", value=2)
+
+        response = self.get("/api/students/2/tasks/", token)
+        assert len(response.json()) == 2
+        Task.objects.filter(student_id=2, name="Nowe").delete()
+
+        response = self.get("/api/students/2/tasks/", token)
+        assert len(response.json()) == 1
+        assert self.stats(token) == {"hits": 0, "misses": 3}
+
+    def test_KeptAfterPoint(self):
+        token = self.access_token()
+        self.get("/api/students/2/tasks/", token)
+        self.get("/api/students/2/prizes/", token)
+        self.post(
+            "/api/students/2/points/", {"content_type": "task", "object_id": 2}, token
+        )
+
+        self.get("/api/students/2/tasks/", token)
+        self.get("/api/students/2/prizes/", token)
+        assert self.stats(token) == {"hits": 2, "misses": 2}
+
+    def test_InvalidatedByStudent(self):
+        token = self.access_token()
+        self.get("/api/students/2/", token)
+        self.patch("/api/students/2/", {"total_points": 7}, token)
+
+        response = self.get("/api/students/2/", token)
+        assert response.json()["total_points"] == 7
+
+    def test_PaginatedSeparately(self):
+        token = self.access_token()
+        response = self.get("/api/students/2/tasks/", token)
+        paginated_response = self.get("/api/students/2/tasks/?page_size=1", token)
+
+        assert paginated_response.content != response.content
+        assert "results" in paginated_response.json()
+
+    def test_StatsForbidden(self):
+        response = self.get("/api/cache-stats/")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,126 @@
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import status
+
+from users.models import DailyPoints, Point
+
+from .common import EndpointTestCase
+
+
+class TestStatsGet(EndpointTestCase):
+    """
+    Tests for '/api/students/<int:student_id>/stats/' GET endpoint.
+    """
+
+    # Fixture specific URL to available student data.
+    VALID_URL = "/api/students/2/stats/"
+    # Fixture specific URL to data not available for current user.
+    NOT_PERMITTED_URL = "/api/students/1/stats/"
+    # Fixture specific URL to invalid student ID.
+    NOT_FOUND_URL = "/api/students/12345/stats/"
+    # Period containing all fixture points.
+    FIXTURE_PERIOD = "since=2024-08-01&until=2024-09-30"
+
+    def test_Days(self):
+        response = self.get(f"{self.VALID_URL}?{self.FIXTURE_PERIOD}")
+
+        # General assertions.
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["Content-Type"] == "application/json"
+
+        # Fixture specific assertions.
+        assert response.json() == [
+            {
+                "date": "2024-08-21",
+                "task_points": 1,
+                "task_count": 1,
+                "prize_points": 90,
+                "prize_count": 3,
+            },
+            {
+                "date": "2024-08-28",
+                "task_points": 0,
+                "task_count": 0,
+                "prize_points": 30,
+                "prize_count": 1,
+            },
+            {
+                "date": "2024-09-04",
+                "task_points": 1,
+                "task_count": 1,
+                "prize_points": 0,
+                "prize_count": 0,
+            },
+        ]
+
+    def test_Weeks(self):
+        response = self.get(f"{self.VALID_URL}?bucket=week&{self.FIXTURE_PERIOD}")
+
+        assert response.status_code == status.HTTP_200_OK
+        dates = [entry["date"] for entry in response.json()]
+        assert dates == ["2024-08-19", "2024-08-26", "2024-09-02"]
+
+    def test_UpdatedByLedger(self):
+        token = self.access_token()
+        for _ in range(2):
+            self.post(
+                "/api/students/2/points/",
+                {"content_type": "task", "object_id": 2},
+                token,
+            )
+        response = self.get(self.VALID_URL, token)
+
+        # Only today's points are within the default period.
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [
+            {
+                "date": timezone.localdate().isoformat(),
+                "task_points": 2,
+                "task_count": 2,
+                "prize_points": 0,
+                "prize_count": 0,
+            }
+        ]
+
+    def test_ChangedPoints(self):
+        # Rollup matches the rebuilt one after points are changed and deleted.
+        points = Point.objects.filter(student_id=2).order_by("pk")
+        points[0].delete()
+        point = points[1]
+        point.value += 5
+        point.save()
+        point = points[2]
+        point.assignment_date -= datetime.timedelta(days=1)
+        point.points_type = Point.TASK_TYPE
+        point.save()
+        Point.objects.filter(student_id=1).delete()
+        updated = set(DailyPoints.objects.values_list())
+
+        call_command("rebuild_daily_points", stdout=StringIO())
+        rebuilt = set(DailyPoints.objects.values_list())
+        assert {row[1:] for row in updated} == {row[1:] for row in rebuilt}
+
+    def test_InvalidPeriod(self):
+        response = self.get(f"{self.VALID_URL}?since=2024-09-30&until=2024-08-01")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        response = self.get(f"{self.VALID_URL}?since=2020-01-01&until=2024-08-01")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_Forbidden(self):
+        response = self.get(self.NOT_PERMITTED_URL)
+        self.assert_not_found(response)
+
+    def test_NotFound(self):
+        response = self.get(self.NOT_FOUND_URL)
+        self.assert_not_found(response)
+
+    def test_NoToken(self):
+        response = self.client.get(self.VALID_URL)
+        self.assert_no_token(response)
+
+    def test_InvalidToken(self):
+        response = self.get(self.VALID_URL, self.bogus_token())
+        self.assert_invalid_token(response)
@@ -1,4 +1,5 @@
 from rest_framework import status
+
 from .common import EndpointTestCase
 
 
@@ -30,6 +31,20 @@ class TestStudentsGet(EndpointTestCase):
         assert "last_name" in entry and entry["last_name"] == "Jakubowski"
         assert "total_points" in entry and entry["total_points"] == 120
 
+    def test_ConstantQueries(self):
+        token = self.access_token()
+        created = 0
+        for count in (1, 10, 1000):
+            self.add_students(count, f"query{count}")
+            created += count
+
+            # Number of queries must not depend on the number of students.
+            # Access (caregiver's version and roles), versions of students
+            # (for 'ETag') and students.
+            with self.assertNumQueries(4):
+                response = self.get(self.VALID_URL, token)
+            assert len(response.json()) == created + 1
+
     def test_NoToken(self):
         response = self.client.get(self.VALID_URL)
         self.assert_no_token(response)
@@ -65,7 +80,7 @@ class TestStudentsPost(EndpointTestCase):
         assert response.headers["Content-Type"] == "application/json"
 
         # Fixture specific assertions.
-        single_student_url = "/api/students/3/"
+        single_student_url = f"/api/students/{response.json()['pk']}/"
         post_op_data = self.get(single_student_url).json()
         assert post_op_data["email"] == "user@example.com"
         assert post_op_data["username"] == "test_username"
@@ -32,6 +32,19 @@ class TestTasksGet(EndpointTestCase):
         assert entry["name"] == "Podlanie kwiatów"
         assert entry["value"] == 1
 
+    def test_Paginated(self):
+        response = self.get(f"{self.VALID_URL}?page_size=1")
+
+        # General assertions.
+        assert response.status_code == status.HTTP_200_OK
+        response_json = response.json()
+        assert set(response_json) == {"next", "previous", "results"}
+
+        # Fixture specific assertions.
+        assert len(response_json["results"]) == 1
+        assert response_json["results"][0]["pk"] == 2
+        assert response_json["previous"] is None
+
     def test_Forbidden(self):
         response = self.get(self.NOT_PERMITTED_URL)
         self.assert_not_found(response)
@@ -72,7 +85,7 @@ class TestTasksPost(EndpointTestCase):
         assert response.headers["Content-Type"] == "application/json"
 
         # Fixture specific assertions.
-        single_task_url = "/api/students/2/task/3/"
+        single_task_url = f"/api/students/2/task/{response.json()['pk']}/"
         post_op_data = self.get(single_task_url).json()
         assert post_op_data["student"] == "2"
         assert post_op_data["name"] == "Another new task to do"
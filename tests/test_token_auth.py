@@ -1,4 +1,10 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.models import Caregiver
+
 from .common import EndpointTestCase
 
 
@@ -22,6 +28,28 @@ class TestTokenAuthPost(EndpointTestCase):
         assert "refresh" in response_json
         assert "access" in response_json
 
+        # Fixture specific assertions.
+        assert AccessToken(response_json["access"])["caregiver_id"] == 1
+
+    def test_NoUserLookup(self):
+        token = self.access_token()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get("/api/students/2/tasks/", token)
+
+        # Authenticated request doesn't load the user.
+        assert response.status_code == status.HTTP_200_OK
+        users_table = connection.ops.quote_name("users_customuser")
+        assert not any(users_table in query["sql"] for query in queries)
+
+    def test_CaregiverRemoved(self):
+        token = self.access_token()
+        assert self.get("/api/students/", token).status_code == status.HTTP_200_OK
+
+        # Token still has 'caregiver_id' claim, but it isn't trusted.
+        Caregiver.objects.filter(pk=1).delete()
+        assert AccessToken(token)["caregiver_id"] == 1
+        self.assert_not_found(self.get("/api/students/", token))
+
     def test_InvalidUsername(self):
         data = {"username": "asdf", "password": "asdf"}
 
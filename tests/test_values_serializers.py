@@ -0,0 +1,75 @@
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from users.models import Point, Prize, Task
+from users.serializers import (
+    PointSerializer,
+    PointValuesSerializer,
+    PrizeSerializer,
+    PrizeValuesSerializer,
+    TaskSerializer,
+    TaskValuesSerializer,
+)
+
+
+class TestValuesSerializers(TestCase):
+    """
+    Output of '.values()' serializers must be the same as output of serializers.
+    """
+
+    SERIALIZERS = [
+        (Task, TaskSerializer, TaskValuesSerializer),
+        (Prize, PrizeSerializer, PrizeValuesSerializer),
+        (Point, PointSerializer, PointValuesSerializer),
+    ]
+
+    def assert_same_output(self):
+        for model, serializer_class, values_serializer_class in self.SERIALIZERS:
+            queryset = model.objects.order_by("pk")
+            expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+            output = JSONRenderer().render(
+                values_serializer_class(
+                    values_serializer_class.values(queryset), many=True
+                ).data
+            )
+
+            assert output == expected
+            assert (
+                values_serializer_class(
+                    values_serializer_class.values(queryset).first()
+                ).data
+                == serializer_class(queryset.first()).data
+            )
+
+    def test_SameOutput(self):
+        self.assert_same_output()
+
+    def test_SameOutputMicroseconds(self):
+        Point.objects.update(
+            assignment_date=datetime.datetime(
+                2024, 3, 4, 5, 6, 7, 891011, tzinfo=datetime.UTC
+            )
+        )
+        self.assert_same_output()
+
+    def test_SameOutputTimezone(self):
+        with timezone.override("Europe/Warsaw"):
+            self.assert_same_output()
+
+    def test_SameSparseOutput(self):
+        for model, serializer_class, values_serializer_class in self.SERIALIZERS:
+            queryset = model.objects.order_by("pk")
+            names = tuple(values_serializer_class.field_columns)
+            for fields in (names[:1], names[1::2], names[-2:]):
+                expected = serializer_class(queryset, many=True, fields=fields).data
+                rows = values_serializer_class.values(queryset, fields)
+                output = values_serializer_class(rows, many=True, fields=fields).data
+
+                assert JSONRenderer().render(output) == JSONRenderer().render(expected)
+                # Columns of other fields aren't selected.
+                assert len(rows.query.values_select) < len(
+                    values_serializer_class.columns
+                )
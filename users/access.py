@@ -0,0 +1,160 @@
+"""
+Resolution of current user's access to students.
+
+Caregiver ID and IDs of accessible students are stored in the cache and
+memoized on the request, so permission classes and views can share them.
+Cache keys contain a version of the user's access, a counter kept in the
+cache and incremented by 'Role' and 'Caregiver' signals (see 'users.signals'),
+so cached access is read without any query. The cache must be shared by
+all processes (see 'REDIS_URL'), otherwise other processes keep using
+stale access until 'ACCESS_CACHE_TIMEOUT'.
+"""
+
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Caregiver, Role
+
+
+@dataclass(frozen=True)
+class Access:
+    """
+    Access of a single user.
+
+    Attributes
+    ----------
+    caregiver_id : int | None
+        ID of caregiver of the user, 'None' if user is not a caregiver.
+    student_ids : frozenset[int]
+        IDs of students available for the user.
+    """
+
+    caregiver_id: int | None
+    student_ids: frozenset[int]
+
+
+NO_ACCESS = Access(caregiver_id=None, student_ids=frozenset())
+
+
+def _version_key(user_id: int) -> str:
+    return f"access_version:{user_id}"
+
+
+def _cache_key(user_id: int, version: int) -> str:
+    return f"access:{user_id}:{version}"
+
+
+def _initial_version() -> int:
+    # Counter lost by the cache (eviction, restart) starts from a new value,
+    # so entries of previous versions are never read again.
+    return time.time_ns()
+
+
+def _caregiver_ids_query(user_id: int):
+    return (
+        Caregiver.objects.filter(user_id=user_id)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+
+def _student_ids_query(caregiver_ids: list[int]):
+    return Role.objects.filter(caregiver_id__in=caregiver_ids).values_list(
+        "student_id", flat=True
+    )
+
+
+def get_access(request) -> Access:
+    """
+    Get access of the user making the request.
+    Result is cached and memoized on the request.
+    """
+    access = getattr(request, "_access", None)
+    if access is not None:
+        return access
+
+    user_id = request.user.id
+    if user_id is None:
+        access = NO_ACCESS
+    else:
+        version_key = _version_key(user_id)
+        version = cache.get(version_key)
+        if version is None:
+            cache.add(version_key, _initial_version(), None)
+            version = cache.get(version_key)
+        key = _cache_key(user_id, version)
+        access = cache.get(key)
+        if access is None:
+            caregiver_ids = list(_caregiver_ids_query(user_id))
+            access = Access(
+                caregiver_id=caregiver_ids[0] if caregiver_ids else None,
+                student_ids=frozenset(_student_ids_query(caregiver_ids)),
+            )
+            cache.set(key, access, settings.ACCESS_CACHE_TIMEOUT)
+    request._access = access
+    return access
+
+
+async def aget_access(request) -> Access:
+    """
+    Async variant of 'get_access'.
+    """
+    access = getattr(request, "_access", None)
+    if access is not None:
+        return access
+
+    user_id = request.user.id
+    if user_id is None:
+        access = NO_ACCESS
+    else:
+        version_key = _version_key(user_id)
+        version = await cache.aget(version_key)
+        if version is None:
+            await cache.aadd(version_key, _initial_version(), None)
+            version = await cache.aget(version_key)
+        key = _cache_key(user_id, version)
+        access = await cache.aget(key)
+        if access is None:
+            caregiver_ids = [pk async for pk in _caregiver_ids_query(user_id)]
+            access = Access(
+                caregiver_id=caregiver_ids[0] if caregiver_ids else None,
+                student_ids=frozenset(
+                    [pk async for pk in _student_ids_query(caregiver_ids)]
+                ),
+            )
+            await cache.aset(key, access, settings.ACCESS_CACHE_TIMEOUT)
+    request._access = access
+    return access
+
+
+def bump_user_access_versions(user_ids) -> None:
+    """
+    Increment access versions of users with given IDs.
+    Their cached access isn't used anymore.
+    """
+    keys = [_version_key(user_id) for user_id in user_ids]
+
+    def bump():
+        for key in keys:
+            try:
+                cache.incr(key)
+            except ValueError:
+                # Missing counter starts from a new value when read.
+                pass
+
+    bump()
+    # Access read by concurrent requests before the commit is dropped again.
+    transaction.on_commit(bump)
+
+
+def bump_access_versions(caregiver_ids) -> None:
+    """
+    Increment access versions of users of caregivers with given IDs.
+    """
+    bump_user_access_versions(
+        Caregiver.objects.filter(pk__in=caregiver_ids).values_list("user_id", flat=True)
+    )
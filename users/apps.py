@@ -1,5 +1,15 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class UsersConfig(AppConfig):
     name = "users"
+
+    def ready(self):
+        # Register signal handlers.
+        from . import signals  # noqa: F401
+        from .content_types import warm_point_content_types
+
+        # Content types are created by 'post_migrate' of 'contenttypes' app,
+        # which runs before this handler.
+        post_migrate.connect(warm_point_content_types, sender=self)
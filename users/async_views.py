@@ -0,0 +1,225 @@
+"""
+Async variants of read-heavy resources.
+
+Under ASGI, 'GET' requests are handled with Django's async ORM, so a single
+worker can serve many concurrent requests waiting on the database.
+Other methods reuse synchronous implementations, run in a thread.
+Used instead of 'users.views' resources when 'ASYNC_VIEWS' setting is enabled.
+"""
+
+import inspect
+
+from asgiref.sync import sync_to_async
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .access import aget_access
+from .export import astream
+from .models import Point, Prize, Task
+from .serializers import (
+    PointValuesSerializer,
+    PrizeValuesSerializer,
+    StudentSerializer,
+    TaskValuesSerializer,
+)
+from .response_cache import cached_response
+from .versions import conditional_get
+from .views import (
+    PointResource,
+    PointsExportResource,
+    PrizesResource,
+    SingleStudentResource,
+    StudentsResource,
+    TasksResource,
+    _NotFoundOrPermissionDenied,
+    _students_for_read,
+)
+
+
+def _sync_handler(handler):
+    """
+    Wrap synchronous handler, so it can be used by async view.
+    """
+
+    async def async_handler(self, request, *args, **kwargs):
+        return await sync_to_async(handler)(self, request, *args, **kwargs)
+
+    return async_handler
+
+
+class _AsyncAPIViewMixin:
+    """
+    Async request handling for '_CustomAPIView' resources.
+
+    Authentication must not query the database (see
+    'users.authentication.TokenUser'). Permissions are
+    checked with 'ahas_permission' when available.
+    """
+
+    options = _sync_handler(APIView.options)
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            method = request.method.lower()
+            if method in self.http_method_names:
+                handler = getattr(self, method, self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def ainitial(self, request, *args, **kwargs):
+        """
+        Async variant of 'APIView.initial'.
+        """
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+        version, scheme = self.determine_version(request, *args, **kwargs)
+        request.version, request.versioning_scheme = version, scheme
+
+        self.perform_authentication(request)
+        await self.acheck_permissions(request)
+        self.check_throttles(request)
+
+    async def acheck_permissions(self, request):
+        """
+        Async variant of 'APIView.check_permissions'.
+        """
+        for permission in self.get_permissions():
+            if hasattr(permission, "ahas_permission"):
+                allowed = await permission.ahas_permission(request, self)
+            else:
+                allowed = permission.has_permission(request, self)
+            if not allowed:
+                self.permission_denied(
+                    request,
+                    message=getattr(permission, "message", None),
+                    code=getattr(permission, "code", None),
+                )
+
+    async def aget_object(self, queryset, **kwargs):
+        """
+        Async variant of 'get_object'.
+        """
+        try:
+            return await queryset.aget(**kwargs)
+
+        except queryset.model.DoesNotExist:
+            raise _NotFoundOrPermissionDenied()
+
+    async def alist_response(self, queryset, serializer_class, fields=None) -> Response:
+        """
+        Async variant of 'list_response'.
+        Paginated responses are prepared in a thread.
+        """
+        if (
+            self.pagination_class is not None
+            and self.pagination_class().get_page_size(self.request) is not None
+        ):
+            return await sync_to_async(self.list_response)(
+                queryset, serializer_class, fields
+            )
+
+        objects = [obj async for obj in queryset]
+        serializer = serializer_class(objects, many=True, fields=fields)
+        return Response(serializer.data)
+
+
+class AsyncStudentsResource(_AsyncAPIViewMixin, StudentsResource):
+    @conditional_get
+    async def get(self, request):
+        fields = StudentSerializer.requested_fields(request)
+        access = await aget_access(request)
+        students = _students_for_read(fields).filter(pk__in=access.student_ids)
+        serializer = StudentSerializer(
+            [obj async for obj in students], many=True, fields=fields
+        )
+
+        return Response(serializer.data)
+
+    post = _sync_handler(StudentsResource.post)
+
+
+class AsyncSingleStudentResource(_AsyncAPIViewMixin, SingleStudentResource):
+    @conditional_get
+    @cached_response
+    async def get(self, request, student_id):
+        fields = StudentSerializer.requested_fields(request)
+        student = await self.aget_object(_students_for_read(fields), pk=student_id)
+        serializer = StudentSerializer(student, fields=fields)
+
+        return Response(serializer.data)
+
+    patch = _sync_handler(SingleStudentResource.patch)
+
+
+class AsyncPrizesResource(_AsyncAPIViewMixin, PrizesResource):
+    @conditional_get
+    @cached_response
+    async def get(self, request, student_id):
+        fields = PrizeValuesSerializer.requested_fields(request)
+        prizes = Prize.objects.filter(student_id=student_id)
+
+        return await self.alist_response(
+            PrizeValuesSerializer.values(prizes, fields),
+            PrizeValuesSerializer,
+            fields,
+        )
+
+    post = _sync_handler(PrizesResource.post)
+
+
+class AsyncTasksResource(_AsyncAPIViewMixin, TasksResource):
+    @conditional_get
+    @cached_response
+    async def get(self, request, student_id):
+        fields = TaskValuesSerializer.requested_fields(request)
+        tasks = Task.objects.filter(student_id=student_id)
+
+        return await self.alist_response(
+            TaskValuesSerializer.values(tasks, fields),
+            TaskValuesSerializer,
+            fields,
+        )
+
+    post = _sync_handler(TasksResource.post)
+
+
+class AsyncPointResource(_AsyncAPIViewMixin, PointResource):
+    @conditional_get
+    async def get(self, request, student_id):
+        fields = PointValuesSerializer.requested_fields(request)
+        points = Point.objects.filter(student_id=student_id).order_by(
+            "-assignment_date", "-id"
+        )
+
+        return await self.alist_response(
+            PointValuesSerializer.values(points, fields), PointValuesSerializer, fields
+        )
+
+    post = _sync_handler(PointResource.post)
+
+
+class AsyncPointsExportResource(_AsyncAPIViewMixin, PointsExportResource):
+    def stream_content(self, points, to_representation, encoder):
+        return astream(
+            points.aiterator(chunk_size=self.CHUNK_SIZE),
+            to_representation,
+            encoder,
+            self.BATCH_SIZE,
+        )
@@ -0,0 +1,47 @@
+"""
+Stateless JWT authentication.
+
+Views need only ID of the current user, so the user is built from validated
+token claims instead of being loaded from the database on every request.
+Full 'CustomUser' row is loaded lazily, when any other attribute is accessed.
+Tokens remain valid until they expire, even if the user is deactivated or
+removed in the meantime.
+"""
+
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import CustomUser
+
+
+class TokenUser:
+    """
+    User backed by a validated token.
+    Used as 'TOKEN_USER_CLASS' of 'SIMPLE_JWT' settings.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, token):
+        self.token = token
+        self.id = self.pk = int(token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def user(self) -> CustomUser:
+        return CustomUser.objects.get(pk=self.id)
+
+    def __getattr__(self, name):
+        # Private and special attributes are never delegated.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.user, name)
+
+    def __str__(self):
+        return f"TokenUser {self.id}"
+
+    def __eq__(self, other):
+        return isinstance(other, (TokenUser, CustomUser)) and self.id == other.id
+
+    def __hash__(self):
+        return hash(self.id)
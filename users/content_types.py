@@ -0,0 +1,42 @@
+"""
+Content types of point sources.
+
+'Point.points_type' values are mapped to IDs of their content types once per
+process, so creating points never queries 'django_content_type'.
+The mapping is prepared after migrations, or on first use in processes that
+don't run them. Resolving it directly in 'AppConfig.ready' would query the
+database before it is migrated (and, in tests, before the test database is
+created).
+"""
+
+from django.contrib.contenttypes.models import ContentType
+
+from .models import Point, Prize, Task
+
+POINT_SOURCE_MODELS = {
+    Point.TASK_TYPE: Task,
+    Point.PRIZE_TYPE: Prize,
+}
+
+_point_content_type_ids: dict[str, int] = {}
+
+
+def warm_point_content_types(**kwargs) -> None:
+    """
+    Resolve content types of all point sources.
+    Also used as 'post_migrate' signal handler.
+    """
+    content_types = ContentType.objects.get_for_models(*POINT_SOURCE_MODELS.values())
+    _point_content_type_ids.update(
+        (points_type, content_types[model].pk)
+        for points_type, model in POINT_SOURCE_MODELS.items()
+    )
+
+
+def point_content_type_id(points_type: str) -> int:
+    """
+    Get content type ID of a point source.
+    """
+    if not _point_content_type_ids:
+        warm_point_content_types()
+    return _point_content_type_ids[points_type]
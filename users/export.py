@@ -0,0 +1,106 @@
+"""
+Streaming export of rows in CSV and NDJSON formats.
+
+Rows are read from an iterator (eg. 'QuerySet.iterator()', which uses
+a server-side cursor) and encoded in batches, so memory use doesn't depend on
+the number of rows and the first batch is sent before the query finishes.
+"""
+
+import csv
+import io
+from collections.abc import AsyncIterable, Callable, Iterable
+
+from rest_framework.renderers import JSONRenderer
+
+# Spreadsheets evaluate cells starting with these characters as formulas.
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _escape_formula(value):
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class CSVEncoder:
+    """
+    Encoder of representations to CSV lines with a header.
+    Text cells which would be evaluated as formulas are prefixed with "'".
+    """
+
+    content_type = "text/csv; charset=utf-8"
+    extension = "csv"
+
+    def __init__(self, fields: tuple[str, ...]):
+        self.fields = fields
+
+    def header(self) -> bytes:
+        return self.encode([dict(zip(self.fields, self.fields))])
+
+    def encode(self, representations: list[dict]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, self.fields)
+        writer.writerows(
+            {name: _escape_formula(value) for name, value in item.items()}
+            for item in representations
+        )
+        return buffer.getvalue().encode()
+
+
+class NDJSONEncoder:
+    """
+    Encoder of representations to JSON lines, one line for each representation.
+    """
+
+    content_type = "application/x-ndjson"
+    extension = "ndjson"
+
+    def __init__(self, renderer: JSONRenderer):
+        self.renderer = renderer
+
+    def header(self) -> bytes:
+        return b""
+
+    def encode(self, representations: list[dict]) -> bytes:
+        render = self.renderer.render
+        return b"".join(render(item) + b"\n" for item in representations)
+
+
+def stream(
+    rows: Iterable,
+    to_representation: Callable,
+    encoder: CSVEncoder | NDJSONEncoder,
+    batch_size: int,
+):
+    """
+    Yield encoded header and batches of 'batch_size' rows.
+    """
+    yield encoder.header()
+    batch = []
+    for row in rows:
+        batch.append(to_representation(row))
+        if len(batch) >= batch_size:
+            yield encoder.encode(batch)
+            batch = []
+    if batch:
+        yield encoder.encode(batch)
+
+
+async def astream(
+    rows: AsyncIterable,
+    to_representation: Callable,
+    encoder: CSVEncoder | NDJSONEncoder,
+    batch_size: int,
+):
+    """
+    Async variant of 'stream', used when served with ASGI.
+    """
+    yield encoder.header()
+    batch = []
+    async for row in rows:
+        batch.append(to_representation(row))
+        if len(batch) >= batch_size:
+            yield encoder.encode(batch)
+            batch = []
+    if batch:
+        yield encoder.encode(batch)
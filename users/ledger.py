@@ -0,0 +1,243 @@
+"""
+Point ledger.
+
+Every change of 'Student.total_points' caused by a task reward or a prize claim
+goes through this module. Balances are changed with a single conditional
+'UPDATE ... SET total_points = total_points + diff' statement, so concurrent
+awards for the same student never overwrite each other and the student row is
+never loaded into Python. The same statement increments 'Student.version'.
+'DailyPoints' rollup and copies of balances in 'Role.total_points' (used for
+ranking) are updated in the same transaction. Points changed or deleted later
+(eg. in the admin) are removed from the rollup by 'users.signals'.
+"""
+
+import operator
+from collections import defaultdict
+from functools import reduce
+
+from django.db import transaction
+from django.db.models import (
+    Case,
+    F,
+    OuterRef,
+    PositiveIntegerField,
+    Q,
+    Subquery,
+    When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .content_types import point_content_type_id
+from .models import DailyPoints, Point, Role, Student
+
+NEGATIVE_BALANCE_MESSAGE = "Ensure this value is greater than or equal to 0."
+
+
+class InsufficientPoints(ValidationError):
+    """
+    Raised when a prize claim would make student's total points negative.
+    Error layout matches the 'StudentSerializer' validation error.
+    """
+
+    def __init__(self):
+        super().__init__({"total_points": [NEGATIVE_BALANCE_MESSAGE]})
+
+
+def points_diff(points_type: str, value: int) -> int:
+    """
+    Return signed balance change for given points type.
+    Tasks add points, prizes subtract them.
+    """
+    return value if points_type == Point.TASK_TYPE else -value
+
+
+def apply_points(student_id: int, diff: int) -> None:
+    """
+    Atomically change student's total points by 'diff'.
+    Raises 'InsufficientPoints' when the balance would go below zero.
+    """
+    students = Student.objects.filter(pk=student_id)
+    if diff < 0:
+        students = students.filter(total_points__gte=-diff)
+    if not students.update(
+        total_points=F("total_points") + diff, version=F("version") + 1
+    ):
+        raise InsufficientPoints()
+    sync_role_points([student_id])
+
+
+def sync_role_points(student_ids) -> None:
+    """
+    Copy total points of students with given IDs to their roles.
+    """
+    # Fixtures may load roles before their students.
+    Role.objects.filter(student_id__in=student_ids).update(
+        total_points=Coalesce(
+            Subquery(
+                Student.objects.filter(pk=OuterRef("student_id")).values("total_points")
+            ),
+            0,
+        )
+    )
+
+
+def new_point(
+    *,
+    student_id: int,
+    assigner_id: int,
+    points_type: str,
+    object_id: int,
+    value: int,
+    name: str,
+) -> Point:
+    """
+    Create unsaved 'Point' linked to a task or prize with given ID.
+    """
+    source_field = "task_id" if points_type == Point.TASK_TYPE else "prize_id"
+    return Point(
+        student_id=student_id,
+        assigner_id=assigner_id,
+        points_type=points_type,
+        content_type_id=point_content_type_id(points_type),
+        object_id=object_id,
+        value=value,
+        name=name,
+        **{source_field: object_id},
+    )
+
+
+def record_point(point: Point) -> Point:
+    """
+    Apply the balance change and save unsaved 'Point' in one transaction.
+    """
+    with transaction.atomic():
+        apply_points(point.student_id, points_diff(point.points_type, point.value))
+        point.save(force_insert=True)
+        add_daily_points([point])
+    return point
+
+
+def record_points(points: list[Point]) -> list[Point | InsufficientPoints]:
+    """
+    Bulk variant of 'record_point'.
+
+    Unsaved 'Point' entries are applied in order. Entries which would make the
+    balance of their student negative are rejected, the rest is inserted with
+    a single 'bulk_create' and all balances are changed with a single 'UPDATE'.
+    Returns saved 'Point' or 'InsufficientPoints' error for each entry.
+    """
+    student_ids = {point.student_id for point in points}
+    results = []
+    with transaction.atomic():
+        # Lock affected students, so balances can't change until commit.
+        balances = dict(
+            Student.objects.select_for_update()
+            .filter(pk__in=student_ids)
+            .order_by("pk")
+            .values_list("pk", "total_points")
+        )
+        diffs = dict.fromkeys(student_ids, 0)
+        accepted = []
+        for point in points:
+            diff = points_diff(point.points_type, point.value)
+            if balances[point.student_id] + diffs[point.student_id] + diff < 0:
+                results.append(InsufficientPoints())
+                continue
+            diffs[point.student_id] += diff
+            accepted.append(point)
+            results.append(point)
+
+        Point.objects.bulk_create(accepted)
+        add_daily_points(accepted)
+        # Students of accepted points, including those with zero balance change.
+        diffs = {point.student_id: diffs[point.student_id] for point in accepted}
+        if diffs:
+            Student.objects.filter(pk__in=diffs).update(
+                total_points=Case(
+                    *(
+                        When(pk=pk, then=F("total_points") + diff)
+                        for pk, diff in diffs.items()
+                        if diff
+                    ),
+                    default=F("total_points"),
+                    output_field=PositiveIntegerField(),
+                ),
+                version=F("version") + 1,
+            )
+            sync_role_points(diffs)
+    return results
+
+
+def _daily_sums(points: list[Point]) -> dict[tuple, list[int]]:
+    """
+    Return '[total, count]' of points per '(student_id, day, points_type)'.
+    """
+    sums = defaultdict(lambda: [0, 0])
+    for point in points:
+        key = (
+            point.student_id,
+            timezone.localdate(point.assignment_date),
+            point.points_type,
+        )
+        sums[key][0] += point.value
+        sums[key][1] += 1
+    return sums
+
+
+def _daily_conditions(sums) -> dict[tuple, Q]:
+    return {key: Q(student_id=key[0], day=key[1], points_type=key[2]) for key in sums}
+
+
+def _increment_daily_points(sums, conditions, sign: int) -> None:
+    DailyPoints.objects.filter(reduce(operator.or_, conditions.values())).update(
+        total=Case(
+            *(
+                When(conditions[key], then=F("total") + sign * total)
+                for key, (total, _) in sums.items()
+            )
+        ),
+        count=Case(
+            *(
+                When(conditions[key], then=F("count") + sign * count)
+                for key, (_, count) in sums.items()
+            )
+        ),
+    )
+
+
+def add_daily_points(points: list[Point]) -> None:
+    """
+    Add saved points to 'DailyPoints' rollup.
+    Uses two queries regardless of the number of points: missing rows are
+    inserted first, then all rows are incremented with a single 'UPDATE'.
+    """
+    sums = _daily_sums(points)
+    if not sums:
+        return
+
+    DailyPoints.objects.bulk_create(
+        (
+            DailyPoints(student_id=student_id, day=day, points_type=points_type)
+            for student_id, day, points_type in sums
+        ),
+        ignore_conflicts=True,
+    )
+    _increment_daily_points(sums, _daily_conditions(sums), 1)
+
+
+def remove_daily_points(points: list[Point]) -> None:
+    """
+    Subtract points from 'DailyPoints' rollup, eg. when they are deleted.
+    Rows left without points are deleted, as they wouldn't be rebuilt.
+    """
+    sums = _daily_sums(points)
+    if not sums:
+        return
+
+    conditions = _daily_conditions(sums)
+    _increment_daily_points(sums, conditions, -1)
+    DailyPoints.objects.filter(
+        reduce(operator.or_, conditions.values()), count=0
+    ).delete()
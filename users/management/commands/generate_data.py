@@ -0,0 +1,354 @@
+import datetime
+import math
+import random
+from collections import defaultdict
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from users.content_types import point_content_type_id
+from users.ledger import sync_role_points
+from users.models import (
+    Caregiver,
+    CustomUser,
+    DailyPoints,
+    Point,
+    Prize,
+    Role,
+    Student,
+    Task,
+)
+
+# Columns of inserted points.
+POINT_COLUMNS = (
+    "value",
+    "assigner_id",
+    "student_id",
+    "assignment_date",
+    "points_type",
+    "content_type_id",
+    "object_id",
+    "task_id",
+    "prize_id",
+    "name",
+)
+
+
+def _poisson(rng: random.Random, mean: float) -> int:
+    """
+    Random number from Poisson distribution (Knuth's algorithm).
+    """
+    limit = math.exp(-mean)
+    count = 0
+    product = rng.random()
+    while product > limit:
+        count += 1
+        product *= rng.random()
+    return count
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic caregivers, students, tasks, prizes and points "
+        "history for performance testing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--caregivers",
+            type=int,
+            default=100,
+            help="Number of caregivers. Default: %(default)s",
+        )
+        parser.add_argument(
+            "--students-per-caregiver",
+            type=float,
+            default=3.0,
+            help="Mean number of students of a caregiver. Default: %(default)s",
+        )
+        parser.add_argument(
+            "--shared-students",
+            type=float,
+            default=0.2,
+            help="Fraction of students with a second caregiver. Default: %(default)s",
+        )
+        parser.add_argument(
+            "--tasks",
+            type=int,
+            default=8,
+            help="Number of tasks of each student. Default: %(default)s",
+        )
+        parser.add_argument(
+            "--prizes",
+            type=int,
+            default=4,
+            help="Number of prizes of each student. Default: %(default)s",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=90,
+            help="Length of points history in days. Default: %(default)s",
+        )
+        parser.add_argument(
+            "--points-per-day",
+            type=float,
+            default=3.0,
+            help="Mean number of task rewards of a student on a weekday, "
+            "halved on weekends. Default: %(default)s",
+        )
+        parser.add_argument(
+            "--prefix",
+            default="gen",
+            help="Prefix of usernames of generated users. Default: %(default)s",
+        )
+        parser.add_argument(
+            "--password",
+            default="zeton",
+            help="Password of generated caregivers. Default: %(default)s",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Random seed. Default: %(default)s"
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of caregivers generated in a single transaction. "
+            "Default: %(default)s",
+        )
+        parser.add_argument(
+            "--no-copy",
+            action="store_false",
+            dest="copy",
+            help="Insert points with 'INSERT' statements instead of PostgreSQL 'COPY'.",
+        )
+
+    def handle(self, *args, **options):
+        prefix = options["prefix"]
+        if CustomUser.objects.filter(username__startswith=f"{prefix}_").exists():
+            raise CommandError(f"Users with '{prefix}_' prefix already exist.")
+
+        self.options = options
+        self.rng = random.Random(options["seed"])
+        self.password = make_password(options["password"])
+        self.use_copy = options["copy"] and connection.vendor == "postgresql"
+        self.content_type_ids = {
+            points_type: point_content_type_id(points_type)
+            for points_type in (Point.TASK_TYPE, Point.PRIZE_TYPE)
+        }
+        self.today = timezone.localdate()
+        self.caregiver_ids = []
+        self.counts = defaultdict(int)
+
+        total = options["caregivers"]
+        batch_size = options["batch_size"]
+        for start in range(0, total, batch_size):
+            with transaction.atomic():
+                self.generate_batch(start, min(batch_size, total - start))
+            self.stdout.write(
+                f"Generated {min(start + batch_size, total)}/{total} caregivers."
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                ", ".join(f"{count} {name}" for name, count in self.counts.items())
+            )
+        )
+
+    def generate_batch(self, start: int, count: int) -> None:
+        """
+        Generate caregivers with IDs from 'start' to 'start + count' and their data.
+        """
+        prefix = self.options["prefix"]
+        users = CustomUser.objects.bulk_create(
+            CustomUser(username=f"{prefix}_caregiver_{index}", password=self.password)
+            for index in range(start, start + count)
+        )
+        caregivers = Caregiver.objects.bulk_create(
+            Caregiver(user=user) for user in users
+        )
+        self.counts["caregivers"] += len(caregivers)
+
+        # Each caregiver has at least one student.
+        assignments = [
+            caregiver
+            for caregiver in caregivers
+            for _ in range(
+                1 + _poisson(self.rng, self.options["students_per_caregiver"] - 1)
+            )
+        ]
+        first_index = self.counts["students"]
+        users = CustomUser.objects.bulk_create(
+            CustomUser(
+                username=f"{prefix}_student_{first_index + index}",
+                password=self.password,
+            )
+            for index in range(len(assignments))
+        )
+        students = Student.objects.bulk_create(
+            Student(user=user, total_points=0) for user in users
+        )
+        self.counts["students"] += len(students)
+
+        # Some students have a second caregiver, from this or earlier batches.
+        self.caregiver_ids.extend(caregiver.pk for caregiver in caregivers)
+        roles = []
+        for caregiver, student in zip(assignments, students):
+            roles.append(
+                Role(role_name="caregiver", caregiver=caregiver, student=student)
+            )
+            second_caregiver_id = self.rng.choice(self.caregiver_ids)
+            if (
+                self.rng.random() < self.options["shared_students"]
+                and second_caregiver_id != caregiver.pk
+            ):
+                roles.append(
+                    Role(
+                        role_name="caregiver",
+                        caregiver_id=second_caregiver_id,
+                        student=student,
+                    )
+                )
+        Role.objects.bulk_create(roles)
+        self.counts["roles"] += len(roles)
+
+        tasks = Task.objects.bulk_create(
+            Task(
+                student=student, name=f"Zadanie {index}", value=self.rng.randint(1, 10)
+            )
+            for student in students
+            for index in range(self.options["tasks"])
+        )
+        prizes = Prize.objects.bulk_create(
+            Prize(
+                student=student,
+                name=f"Nagroda {index}",
+                value=self.rng.randint(10, 100),
+            )
+            for student in students
+            for index in range(self.options["prizes"])
+        )
+        self.counts["tasks"] += len(tasks)
+        self.counts["prizes"] += len(prizes)
+
+        sources = defaultdict(lambda: ([], []))
+        for task in tasks:
+            sources[task.student_id][0].append(task)
+        for prize in prizes:
+            sources[prize.student_id][1].append(prize)
+
+        rows = []
+        daily_points = defaultdict(lambda: [0, 0])
+        balances = {}
+        for caregiver, student in zip(assignments, students):
+            student_tasks, student_prizes = sources[student.pk]
+            balance = 0
+            for day, row in self.points_history(
+                caregiver.pk, student, student_tasks, student_prizes
+            ):
+                rows.append(row)
+                value, points_type = row[0], row[4]
+                balance += value if points_type == Point.TASK_TYPE else -value
+                daily = daily_points[(student.pk, day, points_type)]
+                daily[0] += value
+                daily[1] += 1
+            balances[student.pk] = balance
+
+        self.insert_points(rows)
+        self.counts["points"] += len(rows)
+
+        DailyPoints.objects.bulk_create(
+            (
+                DailyPoints(
+                    student_id=key[0],
+                    day=key[1],
+                    points_type=key[2],
+                    total=total,
+                    count=count,
+                )
+                for key, (total, count) in daily_points.items()
+            ),
+            batch_size=5000,
+        )
+        for student in students:
+            student.total_points = balances[student.pk]
+        Student.objects.bulk_update(students, ["total_points"], batch_size=1000)
+        sync_role_points([student.pk for student in students])
+
+    def points_history(self, assigner_id, student, tasks, prizes):
+        """
+        Yield local day and row of each point of the student, oldest first.
+
+        Tasks are rewarded every day, less on weekends.
+        A prize is claimed once in a while, when the student can afford it.
+        """
+        rng = self.rng
+        current_timezone = timezone.get_current_timezone()
+        balance = 0
+        for days_ago in range(self.options["days"] - 1, -1, -1):
+            day = self.today - datetime.timedelta(days=days_ago)
+            mean = self.options["points_per_day"]
+            if day.weekday() >= 5:
+                mean /= 2
+            rewards = _poisson(rng, mean) if tasks else 0
+            claims = 1 if prizes and rng.random() < 0.15 else 0
+            seconds = sorted(
+                rng.randint(8 * 3600, 20 * 3600) for _ in range(rewards + claims)
+            )
+            midnight = datetime.datetime.combine(
+                day, datetime.time(), tzinfo=current_timezone
+            )
+            for index, second in enumerate(seconds):
+                assignment_date = midnight + datetime.timedelta(seconds=second)
+                if index < rewards:
+                    source = rng.choice(tasks)
+                    points_type = Point.TASK_TYPE
+                else:
+                    source = rng.choice(prizes)
+                    if source.value > balance:
+                        continue
+                    points_type = Point.PRIZE_TYPE
+                balance += (
+                    source.value if points_type == Point.TASK_TYPE else -source.value
+                )
+                yield (
+                    day,
+                    (
+                        source.value,
+                        assigner_id,
+                        student.pk,
+                        assignment_date,
+                        points_type,
+                        self.content_type_ids[points_type],
+                        source.pk,
+                        source.pk if points_type == Point.TASK_TYPE else None,
+                        source.pk if points_type == Point.PRIZE_TYPE else None,
+                        source.name,
+                    ),
+                )
+
+    def insert_points(self, rows: list[tuple]) -> None:
+        """
+        Insert points with PostgreSQL 'COPY', or 'INSERT' statements otherwise.
+        Model isn't used, as 'auto_now_add' would overwrite assignment dates.
+        """
+        table = connection.ops.quote_name(Point._meta.db_table)
+        columns = ", ".join(
+            connection.ops.quote_name(column) for column in POINT_COLUMNS
+        )
+        with connection.cursor() as cursor:
+            if self.use_copy:
+                with cursor.cursor.copy(f"COPY {table} ({columns}) FROM STDIN") as copy:
+                    for row in rows:
+                        copy.write_row(row)
+                return
+
+            adapt_datetime = connection.ops.adapt_datetimefield_value
+            placeholders = ", ".join(["%s"] * len(POINT_COLUMNS))
+            cursor.executemany(
+                f"INSERT INTO {table} ({columns}) VALUES ({placeholders})",
+                [(*row[:3], adapt_datetime(row[3]), *row[4:]) for row in rows],
+            )
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+from users.models import DailyPoints, Point, Student
+
+
+class Command(BaseCommand):
+    help = "Rebuild 'DailyPoints' rollup from points history."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of students rebuilt in a single transaction. "
+            "Default: %(default)s",
+        )
+
+    def handle(self, *args, batch_size, **options):
+        student_ids = list(Student.objects.order_by("pk").values_list("pk", flat=True))
+        for start in range(0, len(student_ids), batch_size):
+            batch = student_ids[start : start + batch_size]
+            rows = (
+                Point.objects.filter(student_id__in=batch)
+                .annotate(day=TruncDate("assignment_date"))
+                .values("student_id", "day", "points_type")
+                .annotate(total=Sum("value"), count=Count("id"))
+                .order_by()
+            )
+            with transaction.atomic():
+                DailyPoints.objects.filter(student_id__in=batch).delete()
+                DailyPoints.objects.bulk_create(
+                    (DailyPoints(**row) for row in rows), batch_size=1000
+                )
+            self.stdout.write(
+                f"Rebuilt {start + len(batch)}/{len(student_ids)} students."
+            )
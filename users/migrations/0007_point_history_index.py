@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0006_point_content_type_point_object_id_point_points_type_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="point",
+            name="value",
+            field=models.PositiveIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name="prize",
+            name="value",
+            field=models.PositiveIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name="student",
+            name="total_points",
+            field=models.PositiveIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name="task",
+            name="value",
+            field=models.PositiveIntegerField(),
+        ),
+        migrations.AddIndex(
+            model_name="point",
+            index=models.Index(
+                fields=["student", "-assignment_date", "-id"],
+                name="student_points_history_idx",
+            ),
+        ),
+    ]
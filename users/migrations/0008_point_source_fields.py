@@ -0,0 +1,62 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:35
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+def backfill_point_sources(apps, schema_editor):
+    """
+    Link existing points to their tasks and prizes and copy their names.
+    Sources which no longer exist are left empty.
+    """
+    Point = apps.get_model("users", "Point")
+    for points_type, source_field, source_model in (
+        ("task", "task", apps.get_model("users", "Task")),
+        ("prize", "prize", apps.get_model("users", "Prize")),
+    ):
+        sources = source_model.objects.filter(pk=OuterRef("object_id"))
+        Point.objects.filter(points_type=points_type).update(
+            **{
+                source_field: Subquery(sources.values("pk")),
+                "name": Coalesce(Subquery(sources.values("name")), Value("")),
+            }
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0007_point_history_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="point",
+            name="name",
+            field=models.CharField(blank=True, default="", max_length=100),
+        ),
+        migrations.AddField(
+            model_name="point",
+            name="prize",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="users.prize",
+            ),
+        ),
+        migrations.AddField(
+            model_name="point",
+            name="task",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="users.task",
+            ),
+        ),
+        migrations.RunPython(backfill_point_sources, migrations.RunPython.noop),
+    ]
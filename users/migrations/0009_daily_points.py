@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0008_point_source_fields"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyPoints",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                (
+                    "points_type",
+                    models.CharField(
+                        choices=[("task", "task"), ("prize", "prize")], max_length=20
+                    ),
+                ),
+                ("total", models.PositiveIntegerField(default=0)),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="users.student"
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "student_daily_points",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="dailypoints",
+            constraint=models.UniqueConstraint(
+                fields=("student", "day", "points_type"),
+                name="unique_student_daily_points",
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0009_daily_points"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="student",
+            name="version",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:04
+
+from django.db import migrations, models
+from django.db.models import Min
+import django.db.models.deletion
+
+
+def remove_duplicate_roles(apps, schema_editor):
+    """
+    Keep only the oldest role of each caregiver and student pair.
+    """
+    Role = apps.get_model("users", "Role")
+    kept_ids = (
+        Role.objects.values("caregiver_id", "student_id")
+        .annotate(kept_id=Min("id"))
+        .values("kept_id")
+    )
+    Role.objects.exclude(id__in=kept_ids).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0010_student_version"),
+    ]
+
+    # New indexes are created before indexes of foreign keys are dropped.
+    operations = [
+        migrations.AddIndex(
+            model_name="prize",
+            index=models.Index(
+                fields=["student", "id"],
+                include=("name", "value"),
+                name="student_prizes_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["student", "id"],
+                include=("name", "value"),
+                name="student_tasks_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="role",
+            index=models.Index(
+                fields=["student", "caregiver"], name="role_student_caregiver_idx"
+            ),
+        ),
+        migrations.RunPython(remove_duplicate_roles, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="role",
+            constraint=models.UniqueConstraint(
+                fields=("caregiver", "student"), name="unique_caregiver_student_role"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="prize",
+            name="student",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="users.student",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="task",
+            name="student",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="users.student",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="role",
+            name="caregiver",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="users.caregiver",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="role",
+            name="student",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="users.student",
+            ),
+        ),
+    ]
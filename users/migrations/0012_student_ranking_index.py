@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0011_role_unique_and_student_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(
+                fields=["-total_points", "id"], name="student_ranking_idx"
+            ),
+        ),
+    ]
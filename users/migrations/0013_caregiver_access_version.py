@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0012_student_ranking_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="caregiver",
+            name="access_version",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:55
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_total_points(apps, schema_editor):
+    """
+    Copy total points of students to their roles.
+    """
+    Role = apps.get_model("users", "Role")
+    Student = apps.get_model("users", "Student")
+    Role.objects.update(
+        total_points=Subquery(
+            Student.objects.filter(pk=OuterRef("student_id")).values("total_points")
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0013_caregiver_access_version"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="student",
+            name="student_ranking_idx",
+        ),
+        migrations.AddField(
+            model_name="role",
+            name="total_points",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(copy_total_points, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="role",
+            index=models.Index(
+                fields=["caregiver", "-total_points", "student"],
+                name="role_ranking_idx",
+            ),
+        ),
+    ]
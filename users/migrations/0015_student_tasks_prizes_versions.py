@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0014_role_ranking"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="student",
+            name="prizes_version",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="student",
+            name="tasks_version",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
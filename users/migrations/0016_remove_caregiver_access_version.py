@@ -0,0 +1,16 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:22
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0015_student_tasks_prizes_versions"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="caregiver",
+            name="access_version",
+        ),
+    ]
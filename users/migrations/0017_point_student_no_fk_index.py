@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:46
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0016_remove_caregiver_access_version"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="point",
+            name="student",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="users.student",
+            ),
+        ),
+    ]
@@ -50,6 +50,11 @@ class Student(models.Model):
 
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
     total_points = models.PositiveIntegerField()
+    # Incremented whenever student's data changes, see 'users.versions'.
+    version = models.PositiveIntegerField(default=0, editable=False)
+    # Incremented only when student's tasks or prizes change.
+    tasks_version = models.PositiveIntegerField(default=0, editable=False)
+    prizes_version = models.PositiveIntegerField(default=0, editable=False)
     caregivers = models.ManyToManyField(
         Caregiver, related_name="students", through="Role"
     )
@@ -76,13 +81,34 @@ class Student(models.Model):
 class Role(models.Model):
     class Meta:
         db_table = "roles"
+        constraints = [
+            # Also used for lookups of students of a caregiver.
+            models.UniqueConstraint(
+                fields=["caregiver", "student"],
+                name="unique_caregiver_student_role",
+            ),
+        ]
+        indexes = [
+            # Caregivers of a student.
+            models.Index(
+                fields=["student", "caregiver"], name="role_student_caregiver_idx"
+            ),
+            # Ranking of students of a caregiver, see 'StudentsRankingResource'.
+            models.Index(
+                fields=["caregiver", "-total_points", "student"],
+                name="role_ranking_idx",
+            ),
+        ]
 
     class RoleNameChoice(models.TextChoices):
         CAREGIVER = "caregiver"
 
     role_name = models.CharField(max_length=30, choices=RoleNameChoice.choices)
-    caregiver = models.ForeignKey(Caregiver, on_delete=models.CASCADE)
-    student = models.ForeignKey(Student, on_delete=models.CASCADE)
+    # Indexed by 'unique_caregiver_student_role' and 'role_student_caregiver_idx'.
+    caregiver = models.ForeignKey(Caregiver, on_delete=models.CASCADE, db_index=False)
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, db_index=False)
+    # Copy of 'Student.total_points' for ranking, kept current by 'users.ledger'.
+    total_points = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return f"{self.role_name} | {self.caregiver.user.first_name}"
@@ -93,6 +119,11 @@ class Point(models.Model):
         db_table = "student_points"
         indexes = [
             models.Index(fields=["content_type", "object_id"]),
+            # Points history of a student, newest first.
+            models.Index(
+                fields=["student", "-assignment_date", "-id"],
+                name="student_points_history_idx",
+            ),
         ]
 
     TASK_TYPE = "task"
@@ -106,7 +137,8 @@ class Point(models.Model):
     value = models.PositiveIntegerField()
 
     assigner = models.ForeignKey(Caregiver, on_delete=models.CASCADE)
-    student = models.ForeignKey(Student, on_delete=models.CASCADE)
+    # Indexed by 'student_points_history_idx'.
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, db_index=False)
     assignment_date = models.DateTimeField(auto_now_add=True)
     points_type = models.CharField(
         max_length=20, choices=POINTS_TYPE, default=PRIZE_TYPE
@@ -116,12 +148,33 @@ class Point(models.Model):
     object_id = models.PositiveIntegerField()
     content_object = GenericForeignKey("content_type", "object_id")
 
+    # Direct links to the source of points, only one of them is set.
+    # Name of the source is copied at award time, so history is kept
+    # even if the source is renamed or removed.
+    task = models.ForeignKey(
+        "Task", null=True, blank=True, on_delete=models.SET_NULL, related_name="+"
+    )
+    prize = models.ForeignKey(
+        "Prize", null=True, blank=True, on_delete=models.SET_NULL, related_name="+"
+    )
+    name = models.CharField(max_length=100, blank=True, default="")
+
 
 class Prize(models.Model):
     class Meta:
         db_table = "student_prizes"
+        indexes = [
+            # Prizes of a student, ordered by ID. Name and value are included,
+            # so lists can be read from the index only (PostgreSQL).
+            models.Index(
+                fields=["student", "id"],
+                include=["name", "value"],
+                name="student_prizes_idx",
+            ),
+        ]
 
-    student = models.ForeignKey(Student, on_delete=models.CASCADE)
+    # Indexed by 'student_prizes_idx'.
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, db_index=False)
     name = models.CharField(max_length=100)
     value = models.PositiveIntegerField()
 
@@ -129,7 +182,40 @@ class Prize(models.Model):
 class Task(models.Model):
     class Meta:
         db_table = "student_tasks"
+        indexes = [
+            # Tasks of a student, ordered by ID. Name and value are included,
+            # so lists can be read from the index only (PostgreSQL).
+            models.Index(
+                fields=["student", "id"],
+                include=["name", "value"],
+                name="student_tasks_idx",
+            ),
+        ]
 
-    student = models.ForeignKey(Student, on_delete=models.CASCADE)
+    # Indexed by 'student_tasks_idx'.
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, db_index=False)
     name = models.CharField(max_length=100)
     value = models.PositiveIntegerField()
+
+
+class DailyPoints(models.Model):
+    """
+    Points of a student summed up per day and points type.
+    Kept up to date by 'users.ledger' and 'users.signals', can be rebuilt from
+    'Point' entries with 'rebuild_daily_points' command.
+    """
+
+    class Meta:
+        db_table = "student_daily_points"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["student", "day", "points_type"],
+                name="unique_student_daily_points",
+            ),
+        ]
+
+    student = models.ForeignKey(Student, on_delete=models.CASCADE)
+    day = models.DateField()
+    points_type = models.CharField(max_length=20, choices=Point.POINTS_TYPE)
+    total = models.PositiveIntegerField(default=0)
+    count = models.PositiveIntegerField(default=0)
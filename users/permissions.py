@@ -1,14 +1,22 @@
-from users.models import Role, Caregiver
 from rest_framework import permissions
 
+from users.access import aget_access, get_access
+
 
 class IsUserCaregiver(permissions.BasePermission):
     def has_permission(self, request, view):
-        return Caregiver.objects.filter(user_id=request.user.id).exists()
+        # 'caregiver_id' claim of the token isn't trusted, it isn't revoked
+        # when the caregiver is removed. Cached access doesn't need any query.
+        return get_access(request).caregiver_id is not None
+
+    async def ahas_permission(self, request, view):
+        return (await aget_access(request)).caregiver_id is not None
 
 
 class HasUserAccessToStudent(permissions.BasePermission):
     def has_permission(self, request, view):
-        return Role.objects.filter(
-            student_id=view.kwargs.get("student_id"), caregiver__user_id=request.user.id
-        ).exists()
+        return view.kwargs.get("student_id") in get_access(request).student_ids
+
+    async def ahas_permission(self, request, view):
+        access = await aget_access(request)
+        return view.kwargs.get("student_id") in access.student_ids
@@ -0,0 +1,137 @@
+"""
+Server-side cache of rendered responses of student resources.
+
+Rendered JSON is stored in the Django cache under a key built from versions
+of the student (see 'users.versions'). Changes of the student, their tasks,
+prizes or points bump the version from 'post_save'/'post_delete' signals or
+the ledger, so stale entries are never read again and simply expire.
+Tasks and prizes have their own versions, so their entries outlive points.
+Only cache operations supported by all backends are used, so the cache works
+with LocMem, Redis and Memcached.
+
+Numbers of hits and misses are counted in the cache, so they are shared by all
+worker processes when a shared backend is used.
+"""
+
+import hashlib
+import inspect
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from rest_framework import status
+
+from zeton_backend.profiling import rendering
+
+from .versions import aget_versions, get_versions
+
+HITS_KEY = "response_cache:hits"
+MISSES_KEY = "response_cache:misses"
+
+
+def _cache_key(request, versions: list[tuple[int, int]]) -> str:
+    digest = hashlib.md5(
+        f"{request.get_full_path()}:{versions}".encode(), usedforsecurity=False
+    ).hexdigest()
+    return f"response:{digest}"
+
+
+def _is_cacheable(request) -> bool:
+    # Browsable API renders request specific content.
+    return request.accepted_renderer.format == "json"
+
+
+def _count(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Counter doesn't exist yet or has been evicted.
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+async def _acount(key: str) -> None:
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aadd(key, 0, timeout=None)
+        await cache.aincr(key)
+
+
+def _cached_response(entry) -> HttpResponse:
+    content, content_type = entry
+    return HttpResponse(content, content_type=content_type)
+
+
+def _render(view, request, response):
+    """
+    Render handler's response, return cache entry or 'None' if not cacheable.
+    """
+    if response.status_code != status.HTTP_200_OK:
+        return None
+    response.accepted_renderer = request.accepted_renderer
+    response.accepted_media_type = request.accepted_media_type
+    response.renderer_context = view.get_renderer_context()
+    with rendering():
+        response.render()
+    return response.content, response["Content-Type"]
+
+
+def get_stats() -> dict[str, int]:
+    """
+    Return numbers of cache hits and misses.
+    """
+    counters = cache.get_many([HITS_KEY, MISSES_KEY])
+    return {
+        "hits": counters.get(HITS_KEY, 0),
+        "misses": counters.get(MISSES_KEY, 0),
+    }
+
+
+def cached_response(handler):
+    """
+    Decorator of 'get' handlers of student resources, sync or async.
+    Resource is versioned as described in 'users.versions.get_versions'.
+    """
+    if inspect.iscoroutinefunction(handler):
+
+        @wraps(handler)
+        async def async_wrapper(self, request, *args, **kwargs):
+            if not _is_cacheable(request):
+                return await handler(self, request, *args, **kwargs)
+
+            key = _cache_key(request, await aget_versions(self, request, kwargs))
+            entry = await cache.aget(key)
+            if entry is not None:
+                await _acount(HITS_KEY)
+                return _cached_response(entry)
+
+            await _acount(MISSES_KEY)
+            response = await handler(self, request, *args, **kwargs)
+            entry = _render(self, request, response)
+            if entry is not None:
+                await cache.aset(key, entry, settings.RESPONSE_CACHE_TIMEOUT)
+            return response
+
+        return async_wrapper
+
+    @wraps(handler)
+    def wrapper(self, request, *args, **kwargs):
+        if not _is_cacheable(request):
+            return handler(self, request, *args, **kwargs)
+
+        key = _cache_key(request, get_versions(self, request, kwargs))
+        entry = cache.get(key)
+        if entry is not None:
+            _count(HITS_KEY)
+            return _cached_response(entry)
+
+        _count(MISSES_KEY)
+        response = handler(self, request, *args, **kwargs)
+        entry = _render(self, request, response)
+        if entry is not None:
+            cache.set(key, entry, settings.RESPONSE_CACHE_TIMEOUT)
+        return response
+
+    return wrapper
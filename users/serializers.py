@@ -1,9 +1,95 @@
-from rest_framework import serializers
+import datetime
 
-from users.models import CustomUser, Point, Prize, Student, Task, Role
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
+from users.content_types import point_content_type_id
+from users.models import Caregiver, CustomUser, Point, Prize, Student, Task, Role
+from zeton_backend.profiling import serialization
 
-class StudentSerializer(serializers.Serializer):
+
+def _query_names(request, parameter: str, available) -> tuple[str, ...] | None:
+    """
+    Return names listed in comma-separated query parameter, in order of
+    'available'. 'None' when the parameter isn't given.
+    """
+    value = request.query_params.get(parameter)
+    if value is None:
+        return None
+    names = {name.strip() for name in value.split(",")} - {""}
+    unknown = sorted(names.difference(available))
+    if unknown:
+        raise serializers.ValidationError(
+            {parameter: [f"Unknown field '{name}'." for name in unknown]}
+        )
+    return tuple(name for name in available if name in names)
+
+
+def requested_fields(request, fields, includes=()) -> tuple[str, ...] | None:
+    """
+    Return names of fields selected with '?fields=' query parameter, followed
+    by names of related objects selected with '?include=' query parameter.
+    Without a parameter, all 'fields' or all 'includes' are selected.
+    'None' is returned when neither parameter is given, ie. all fields.
+    """
+    selected = _query_names(request, "fields", fields)
+    included = _query_names(request, "include", includes)
+    if selected is None and included is None:
+        return None
+    if selected == ():
+        raise serializers.ValidationError(
+            {"fields": ["At least one field is required."]}
+        )
+    return (
+        *(fields if selected is None else selected),
+        *(includes if included is None else included),
+    )
+
+
+class _MeasuredListSerializer(serializers.ListSerializer):
+    """
+    List serializer measured as a whole by profiling, not for each item.
+    """
+
+    @property
+    def data(self):
+        with serialization():
+            return super().data
+
+
+class SparseFieldsMixin:
+    """
+    Serializer returning only fields given by 'fields' argument, eg. selected
+    with '?fields=' and '?include=', see 'requested_fields'. 'None' - all fields.
+    """
+
+    class Meta:
+        list_serializer_class = _MeasuredListSerializer
+
+    # Fields of related objects, selected with '?include=' instead of '?fields='.
+    include_fields: tuple[str, ...] = ()
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields).difference(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def requested_fields(cls, request) -> tuple[str, ...] | None:
+        names = [name for name in cls().fields if name not in cls.include_fields]
+        return requested_fields(request, names, cls.include_fields)
+
+    @property
+    def data(self):
+        with serialization():
+            return super().data
+
+
+class StudentSerializer(SparseFieldsMixin, serializers.Serializer):
     pk = serializers.IntegerField(read_only=True)
     email = serializers.EmailField(source="user.email")
     username = serializers.CharField(source="user.username")
@@ -34,9 +120,25 @@ class StudentSerializer(serializers.Serializer):
         return instance
 
 
-class PrizeSerializer(serializers.Serializer):
+class RankedStudentSerializer(StudentSerializer):
+    """
+    Student with their 'rank' attribute, see 'StudentsRankingResource'.
+    """
+
+    rank = serializers.IntegerField(read_only=True)
+
+
+class RankingQuerySerializer(serializers.Serializer):
+    """
+    Query parameters of students ranking.
+    """
+
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+
+class PrizeSerializer(SparseFieldsMixin, serializers.Serializer):
     pk = serializers.IntegerField(read_only=True)
-    student = serializers.CharField(source="student.id", read_only=True)
+    student = serializers.CharField(source="student_id", read_only=True)
     name = serializers.CharField()
     value = serializers.IntegerField(min_value=0)
 
@@ -51,7 +153,7 @@ class PrizeSerializer(serializers.Serializer):
         return instance
 
 
-class TaskSerializer(serializers.Serializer):
+class TaskSerializer(SparseFieldsMixin, serializers.Serializer):
     pk = serializers.IntegerField(read_only=True)
     student = serializers.CharField(source="student_id", read_only=True)
     name = serializers.CharField()
@@ -74,6 +176,22 @@ class CustomUserSerializer(serializers.ModelSerializer):
         fields = ("id", "username")
 
 
+class CaregiverTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Token pair with ID of user's caregiver in 'caregiver_id' claim.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token["caregiver_id"] = (
+            Caregiver.objects.filter(user_id=user.id)
+            .values_list("pk", flat=True)
+            .first()
+        )
+        return token
+
+
 class CustomUserSerializerWithToken(serializers.ModelSerializer):  # Handling Register
     token = serializers.SerializerMethodField()
     password = serializers.CharField(write_only=True)
@@ -91,8 +209,11 @@ class CustomUserSerializerWithToken(serializers.ModelSerializer):  # Handling Re
         fields = ("token", "username", "password")
 
 
-class PointSerializer(serializers.ModelSerializer):
-    class Meta:
+class PointSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    # Content type is derived from 'points_type'.
+    content_type = serializers.IntegerField(source="content_type_id", read_only=True)
+
+    class Meta(SparseFieldsMixin.Meta):
         model = Point
         fields = (
             "pk",
@@ -103,10 +224,247 @@ class PointSerializer(serializers.ModelSerializer):
             "points_type",
             "content_type",
             "object_id",
+            "name",
+        )
+        read_only_fields = ("name",)
+
+    def create(self, validated_data):
+        validated_data["content_type_id"] = point_content_type_id(
+            validated_data["points_type"]
         )
+        return super().create(validated_data)
+
+
+class DashboardStudentSerializer(StudentSerializer):
+    """
+    Student with their tasks, prizes and latest points, see 'DashboardResource'.
+    Related objects are expected to be prefetched.
+    """
+
+    include_fields = ("tasks", "prizes", "points")
+
+    tasks = TaskSerializer(source="task_set", many=True, read_only=True)
+    prizes = PrizeSerializer(source="prize_set", many=True, read_only=True)
+    points = PointSerializer(source="latest_points", many=True, read_only=True)
+
+
+class DashboardQuerySerializer(serializers.Serializer):
+    """
+    Query parameters of caregiver's dashboard.
+    """
+
+    points = serializers.IntegerField(min_value=1, max_value=50, default=5)
+
+
+class NewPointSerializer(serializers.Serializer):
+    """
+    Request of a new point of the student, for a task or a prize.
+    """
+
+    content_type = serializers.ChoiceField(choices=Point.POINTS_TYPE)
+    object_id = serializers.IntegerField()
+
+
+class BulkPointSerializer(NewPointSerializer):
+    """
+    Single entry of the bulk points request.
+    """
+
+    student = serializers.IntegerField()
+
+
+class PointsStatsQuerySerializer(serializers.Serializer):
+    """
+    Query parameters of points statistics.
+    Last 30 days are returned by default.
+    """
+
+    DAY = "day"
+    WEEK = "week"
+
+    # Longest available period, in days.
+    MAX_DAYS = 366
+
+    bucket = serializers.ChoiceField(choices=(DAY, WEEK), default=DAY)
+    since = serializers.DateField(required=False)
+    until = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        until = attrs.get("until") or timezone.localdate()
+        since = attrs.get("since") or until - datetime.timedelta(days=29)
+        if since > until:
+            raise serializers.ValidationError({"since": "Must not be after 'until'."})
+        if (until - since).days >= self.MAX_DAYS:
+            raise serializers.ValidationError(
+                {"since": f"Period must not be longer than {self.MAX_DAYS} days."}
+            )
+        return {**attrs, "since": since, "until": until}
+
+
+class PointsExportQuerySerializer(serializers.Serializer):
+    """
+    Query parameters of points history export.
+    'file_format' is used, as 'format' is reserved by DRF content negotiation.
+    """
+
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+    file_format = serializers.ChoiceField(choices=(CSV, NDJSON), default=CSV)
 
 
 class RoleSerializer(serializers.ModelSerializer):
     class Meta:
         model = Role
         fields = ["role_name", "caregiver", "student"]
+
+
+# Read-only serializers of '.values()' rows.
+# Used by list endpoints, where DRF field machinery dominates CPU time.
+# Output must be the same as output of the corresponding serializer.
+
+
+def _datetime_representation():
+    """
+    Return function converting datetimes like 'serializers.DateTimeField'.
+    Current timezone is resolved once, not for each value.
+    """
+    if api_settings.DATETIME_FORMAT != ISO_8601 or not settings.USE_TZ:
+        return serializers.DateTimeField().to_representation
+
+    current_timezone = timezone.get_current_timezone()
+
+    def to_representation(value):
+        if not value:
+            return None
+        value = value.astimezone(current_timezone).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return to_representation
+
+
+class _ValuesSerializer:
+    """
+    Base class of read-only serializers of '.values()' rows.
+    Interface matches 'serializer_class(rows, many=True, fields=fields).data'.
+    """
+
+    # Column of '.values()' rows of each field, in order of the representation.
+    field_columns: dict[str, str] = {}
+    # Columns loaded even when their fields aren't selected, eg. for pagination.
+    required_columns: tuple[str, ...] = ("id",)
+    # Columns of '.values()' rows of all fields.
+    columns: tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.columns = tuple(cls.field_columns.values())
+
+    def __init__(self, instance, many=False, fields=None):
+        self.instance = instance
+        self.many = many
+        self.fields = fields
+
+    @classmethod
+    def requested_fields(cls, request) -> tuple[str, ...] | None:
+        return requested_fields(request, tuple(cls.field_columns))
+
+    @classmethod
+    def selected_columns(cls, fields=None) -> tuple[str, ...]:
+        """
+        Return columns needed by given fields, 'None' - all fields.
+        """
+        if fields is None:
+            return cls.columns
+        columns = {*cls.required_columns, *(cls.field_columns[name] for name in fields)}
+        return tuple(column for column in cls.columns if column in columns)
+
+    @classmethod
+    def values(cls, queryset, fields=None):
+        """
+        Return queryset of rows accepted by the serializer.
+        """
+        return queryset.values(*cls.selected_columns(fields))
+
+    def field_converters(self) -> dict:
+        """
+        Return functions converting column values of fields, others are copied.
+        """
+        return {}
+
+    def row_serializer(self):
+        """
+        Return function converting single row to the representation of 'fields'.
+        Fields, their columns and converters are resolved once, not for each row.
+        """
+        converters = self.field_converters()
+        fields = tuple(
+            (name, column, converters.get(name))
+            for name, column in self.field_columns.items()
+            if self.fields is None or name in self.fields
+        )
+
+        def to_representation(row):
+            return {
+                name: row[column] if convert is None else convert(row[column])
+                for name, column, convert in fields
+            }
+
+        return to_representation
+
+    @property
+    def data(self):
+        with serialization():
+            to_representation = self.row_serializer()
+            if self.many:
+                return [to_representation(row) for row in self.instance]
+            return to_representation(self.instance)
+
+
+class _SourceValuesSerializer(_ValuesSerializer):
+    """
+    Values variant of 'TaskSerializer' and 'PrizeSerializer'.
+    """
+
+    field_columns = {
+        "pk": "id",
+        "student": "student_id",
+        "name": "name",
+        "value": "value",
+    }
+
+    def field_converters(self):
+        return {"student": str}
+
+
+class TaskValuesSerializer(_SourceValuesSerializer):
+    pass
+
+
+class PrizeValuesSerializer(_SourceValuesSerializer):
+    pass
+
+
+class PointValuesSerializer(_ValuesSerializer):
+    """
+    Values variant of 'PointSerializer'.
+    """
+
+    field_columns = {
+        "pk": "id",
+        "value": "value",
+        "assigner": "assigner_id",
+        "student": "student_id",
+        "assignment_date": "assignment_date",
+        "points_type": "points_type",
+        "content_type": "content_type_id",
+        "object_id": "object_id",
+        "name": "name",
+    }
+    # Position of a cursor page, see 'PointsCursorPagination'.
+    required_columns = ("id", "assignment_date")
+
+    def field_converters(self):
+        return {"assignment_date": _datetime_representation()}
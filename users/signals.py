@@ -0,0 +1,88 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .access import bump_access_versions, bump_user_access_versions
+from .ledger import add_daily_points, remove_daily_points, sync_role_points
+from .models import Caregiver, CustomUser, Point, Prize, Role, Student, Task
+from .versions import bump_versions
+
+
+@receiver([post_save, post_delete], sender=Role)
+def bump_role_access_version(sender, instance, **kwargs):
+    bump_access_versions([instance.caregiver_id])
+
+
+@receiver([post_save, post_delete], sender=Caregiver)
+def bump_caregiver_access_version(sender, instance, **kwargs):
+    bump_user_access_versions([instance.user_id])
+
+
+@receiver(post_save, sender=Role)
+def copy_new_role_points(sender, instance, created, **kwargs):
+    if created:
+        sync_role_points([instance.student_id])
+
+
+@receiver([post_save, post_delete], sender=Task)
+def bump_task_student_version(sender, instance, **kwargs):
+    bump_versions([instance.student_id], "tasks_version")
+
+
+@receiver([post_save, post_delete], sender=Prize)
+def bump_prize_student_version(sender, instance, **kwargs):
+    bump_versions([instance.student_id], "prizes_version")
+
+
+@receiver([post_save, post_delete], sender=Point)
+def bump_point_student_version(sender, instance, created=False, **kwargs):
+    # New points are added by 'users.ledger', which bumps the version itself.
+    if not created:
+        bump_versions([instance.student_id])
+
+
+@receiver(pre_save, sender=Point)
+def load_saved_point(sender, instance, raw, **kwargs):
+    # Changed points are moved in 'DailyPoints' rollup, see below.
+    instance._saved_point = None
+    if instance.pk is not None and not raw:
+        instance._saved_point = (
+            Point.objects.filter(pk=instance.pk)
+            .only("student_id", "assignment_date", "points_type", "value")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Point)
+def move_changed_daily_points(sender, instance, created, **kwargs):
+    # New points are added by 'users.ledger'. Queryset 'update()' isn't seen
+    # here, rollup has to be rebuilt with 'rebuild_daily_points' after it.
+    saved = getattr(instance, "_saved_point", None)
+    if created or saved is None:
+        return
+    fields = ("student_id", "assignment_date", "points_type", "value")
+    if any(getattr(saved, field) != getattr(instance, field) for field in fields):
+        remove_daily_points([saved])
+        add_daily_points([instance])
+
+
+@receiver(post_delete, sender=Point)
+def remove_deleted_daily_points(sender, instance, **kwargs):
+    remove_daily_points([instance])
+
+
+@receiver(post_save, sender=Student)
+def bump_saved_student_version(sender, instance, created, raw, **kwargs):
+    if not created:
+        bump_versions([instance.pk])
+    if raw or not created:
+        # Total points may be changed directly, eg. by 'StudentSerializer',
+        # or loaded by fixtures after roles of the student.
+        sync_role_points([instance.pk])
+
+
+@receiver(post_save, sender=CustomUser)
+def bump_user_students_versions(sender, instance, update_fields, **kwargs):
+    # Logging in only updates 'last_login', which isn't part of student's data.
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return
+    bump_versions(Student.objects.filter(user_id=instance.pk).values("pk"))
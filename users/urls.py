@@ -1,31 +1,78 @@
+from django.conf import settings
 from django.urls import path
 from rest_framework_simplejwt.views import token_obtain_pair
 
 from users.views import (
     current_user,
+    response_cache_stats,
+    profiling_metrics,
+    DashboardResource,
     StudentsResource,
+    StudentsRankingResource,
+    StudentRankResource,
     SingleStudentResource,
     PrizesResource,
     SinglePrizeResource,
     TasksResource,
     SingleTaskResource,
     PointResource,
+    PointsExportResource,
+    BulkPointResource,
+    PointsStatsResource,
 )
 
+if settings.ASYNC_VIEWS:
+    from users.async_views import (
+        AsyncStudentsResource as StudentsResource,
+        AsyncSingleStudentResource as SingleStudentResource,
+        AsyncPrizesResource as PrizesResource,
+        AsyncTasksResource as TasksResource,
+        AsyncPointResource as PointResource,
+        AsyncPointsExportResource as PointsExportResource,
+    )
+
 urlpatterns = [
     path("token-auth/", token_obtain_pair),
     path("current-user/", current_user),
+    path("cache-stats/", response_cache_stats),
+    path("metrics/", profiling_metrics),
+    path("dashboard/", DashboardResource.as_view(), name="dashboard-resource"),
     path("students/", StudentsResource.as_view(), name="students-resource"),
+    path(
+        "students/points/",
+        BulkPointResource.as_view(),
+        name="bulk-points-resource",
+    ),
+    path(
+        "students/ranking/",
+        StudentsRankingResource.as_view(),
+        name="students-ranking-resource",
+    ),
     path(
         "students/<int:student_id>/",
         SingleStudentResource.as_view(),
         name="student-resource",
     ),
+    path(
+        "students/<int:student_id>/rank/",
+        StudentRankResource.as_view(),
+        name="student-rank-resource",
+    ),
     path(
         "students/<int:student_id>/points/",
         PointResource.as_view(),
         name="points-resource",
     ),
+    path(
+        "students/<int:student_id>/points/export/",
+        PointsExportResource.as_view(),
+        name="points-export-resource",
+    ),
+    path(
+        "students/<int:student_id>/stats/",
+        PointsStatsResource.as_view(),
+        name="stats-resource",
+    ),
     path(
         "students/<int:student_id>/prizes/",
         PrizesResource.as_view(),
@@ -0,0 +1,132 @@
+"""
+Per-student data versions and conditional 'GET' requests.
+
+'Student.version' is incremented whenever the student, their tasks, prizes or
+points change. Point balance changes bump it in the same 'UPDATE' statement
+(see 'users.ledger'), other changes are handled by signals (see
+'users.signals'). ETags of student resources are derived from versions, so
+'If-None-Match' requests are answered with '304 Not Modified' after a single
+primary key query, without loading or serializing the resource.
+
+Tasks and prizes are versioned by 'Student.tasks_version' and
+'Student.prizes_version' (views' 'version_field' attribute) instead, which
+aren't bumped by points, the most frequent change.
+"""
+
+import hashlib
+import inspect
+from functools import wraps
+
+from django.db.models import F
+from django.utils.cache import get_conditional_response
+
+from .access import aget_access, get_access
+from .models import Student
+
+
+def bump_versions(student_ids, *fields) -> None:
+    """
+    Increment versions of students with given IDs.
+    'fields' are other version fields to increment, eg. 'tasks_version'.
+    """
+    Student.objects.filter(pk__in=student_ids).update(
+        **{field: F(field) + 1 for field in ("version", *fields)}
+    )
+
+
+def _versions_query(student_ids, field: str):
+    return Student.objects.filter(pk__in=student_ids).values_list("pk", field)
+
+
+def _version_field(view) -> str:
+    return getattr(view, "version_field", "version")
+
+
+def _etag(request, versions: list[tuple[int, int]]) -> str | None:
+    """
+    Weak ETag of versions of students, 'None' if there are no students.
+    Accepted media type is included, as each renderer produces a different body.
+    """
+    if not versions:
+        return None
+    digest = hashlib.md5(
+        f"{request.accepted_media_type}:{versions}".encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _requested_student_ids(access, kwargs):
+    student_id = kwargs.get("student_id")
+    return access.student_ids if student_id is None else [student_id]
+
+
+def get_versions(view, request, kwargs) -> list[tuple[int, int]]:
+    """
+    Get '(student ID, version)' pairs of students of the requested resource.
+
+    Resource is versioned by the student from 'student_id' URL argument or,
+    if there is no such argument, by all students available for the user.
+    'version_field' of the view ('version' by default) is read.
+    Result is memoized on the request.
+    """
+    versions = getattr(request, "_versions", None)
+    if versions is None:
+        student_ids = _requested_student_ids(get_access(request), kwargs)
+        versions = sorted(_versions_query(student_ids, _version_field(view)))
+        request._versions = versions
+    return versions
+
+
+async def aget_versions(view, request, kwargs) -> list[tuple[int, int]]:
+    """
+    Async variant of 'get_versions'.
+    """
+    versions = getattr(request, "_versions", None)
+    if versions is None:
+        student_ids = _requested_student_ids(await aget_access(request), kwargs)
+        versions = sorted(
+            [row async for row in _versions_query(student_ids, _version_field(view))]
+        )
+        request._versions = versions
+    return versions
+
+
+def conditional_get(handler):
+    """
+    Decorator of 'get' handlers of student resources, sync or async.
+
+    Resource is versioned as described in 'get_versions'.
+    Must be applied to handlers only, so permissions are checked first.
+    """
+    if inspect.iscoroutinefunction(handler):
+
+        @wraps(handler)
+        async def async_wrapper(self, request, *args, **kwargs):
+            etag = _etag(request, await aget_versions(self, request, kwargs))
+            if etag is None:
+                return await handler(self, request, *args, **kwargs)
+
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = await handler(self, request, *args, **kwargs)
+            if response.status_code < 400:
+                response.headers.setdefault("ETag", etag)
+            return response
+
+        return async_wrapper
+
+    @wraps(handler)
+    def wrapper(self, request, *args, **kwargs):
+        etag = _etag(request, get_versions(self, request, kwargs))
+        if etag is None:
+            return handler(self, request, *args, **kwargs)
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = handler(self, request, *args, **kwargs)
+        if response.status_code < 400:
+            response.headers.setdefault("ETag", etag)
+        return response
+
+    return wrapper
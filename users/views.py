@@ -1,23 +1,47 @@
-from django.contrib.contenttypes.models import ContentType
+from django.db.models import F, Prefetch, QuerySet, Sum
+from django.db.models.functions import TruncWeek
+from django.http import StreamingHttpResponse
 from rest_framework import permissions, status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.exceptions import (
     NotAuthenticated,
     APIException,
 )
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
-from .models import Caregiver, Student, Prize, Task, Point
+from zeton_backend.pagination import CustomCursorPagination, PointsCursorPagination
+from zeton_backend.profiling import PrometheusRenderer, get_metrics
+
+from .access import get_access
+from .content_types import POINT_SOURCE_MODELS
+from .export import CSVEncoder, NDJSONEncoder, stream
+from .ledger import new_point, record_point, record_points
+from .models import DailyPoints, Student, Prize, Role, Task, Point
 from .permissions import HasUserAccessToStudent, IsUserCaregiver
 
+from .response_cache import cached_response, get_stats
+from .versions import conditional_get
+
 from .serializers import (
+    BulkPointSerializer,
     CustomUserSerializer,
     CustomUserSerializerWithToken,
+    DashboardQuerySerializer,
+    DashboardStudentSerializer,
+    NewPointSerializer,
     StudentSerializer,
     PrizeSerializer,
+    PrizeValuesSerializer,
     TaskSerializer,
+    TaskValuesSerializer,
     PointSerializer,
+    PointValuesSerializer,
+    PointsExportQuerySerializer,
+    PointsStatsQuerySerializer,
+    RankedStudentSerializer,
+    RankingQuerySerializer,
     RoleSerializer,
 )
 
@@ -32,6 +56,28 @@ def current_user(request):
     return Response(serializer.data)
 
 
+@api_view(["GET"])
+@permission_classes([permissions.IsAdminUser])
+def response_cache_stats(request):
+    """
+    Return numbers of hits and misses of the response cache.
+    """
+
+    return Response(get_stats())
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAdminUser])
+@renderer_classes([*api_settings.DEFAULT_RENDERER_CLASSES, PrometheusRenderer])
+def profiling_metrics(request):
+    """
+    Return histograms of profiled requests of this worker process.
+    Prometheus text format is returned with '?format=prometheus'.
+    """
+
+    return Response(get_metrics())
+
+
 class UserList(APIView):
     """
     Create a new user. It's called 'UserList' because normally we'd have a get
@@ -70,18 +116,69 @@ class _CustomAPIView(APIView):
             raise NotAuthenticated()
         raise _NotFoundOrPermissionDenied()
 
+    # Pagination of list responses, 'None' disables pagination.
+    pagination_class = None
+    # Field of 'Student' versioning responses, see 'users.versions'.
+    version_field = "version"
+
+    def list_response(self, queryset, serializer_class, fields=None) -> Response:
+        """
+        Serialize queryset, paginated if 'pagination_class' is set and requested.
+        'fields' are passed to the serializer, 'None' - all fields.
+        """
+        if self.pagination_class is not None:
+            paginator = self.pagination_class()
+            page = paginator.paginate_queryset(queryset, self.request, view=self)
+            if page is not None:
+                serializer = serializer_class(page, many=True, fields=fields)
+                return paginator.get_paginated_response(serializer.data)
+
+        serializer = serializer_class(queryset, many=True, fields=fields)
+        return Response(serializer.data)
+
     def get_object(self, model_type, **kwargs):
         """
         Return object or raise 404.
+        'model_type' is either a model or a queryset.
         Replacement for 'get_object_or_404', but with consistent error message.
         """
+        queryset = (
+            model_type if isinstance(model_type, QuerySet) else model_type.objects
+        )
         try:
-            return model_type.objects.get(**kwargs)
+            return queryset.get(**kwargs)
 
-        except model_type.DoesNotExist:
+        except queryset.model.DoesNotExist:
             raise _NotFoundOrPermissionDenied()
 
 
+# Columns used by each field of 'StudentSerializer'.
+_STUDENT_COLUMNS = {
+    "email": "user__email",
+    "username": "user__username",
+    "first_name": "user__first_name",
+    "last_name": "user__last_name",
+    "total_points": "total_points",
+}
+
+
+def _students_for_read(fields=None):
+    """
+    Students with user data fetched in the same query.
+    Only columns used by given fields of 'StudentSerializer' are loaded,
+    'None' - all fields. User isn't joined when none of its fields is needed.
+    """
+    columns = [
+        column
+        for name, column in _STUDENT_COLUMNS.items()
+        if fields is None or name in fields
+    ]
+    students = Student.objects.only("pk", *columns)
+    if any(column.startswith("user__") for column in columns):
+        students = students.select_related("user")
+    return students
+
+
 class StudentsResource(_CustomAPIView):
     """
     Access students assigned to current user.
@@ -93,16 +190,19 @@ class StudentsResource(_CustomAPIView):
     serializer_class = StudentSerializer
     permission_classes = [permissions.IsAuthenticated, IsUserCaregiver]
 
+    @conditional_get
     def get(self, request):
-        caregiver = self.get_object(Caregiver, user_id=request.user.id)
-        students = caregiver.students.all()
-        serializer = StudentSerializer(students, many=True)
+        fields = StudentSerializer.requested_fields(request)
+        students = _students_for_read(fields).filter(
+            pk__in=get_access(request).student_ids
+        )
+        serializer = StudentSerializer(students, many=True, fields=fields)
 
         return Response(serializer.data)
 
     def post(self, request):
         # Create new student entry.
-        caregiver = self.get_object(Caregiver, user_id=request.user.id)
+        caregiver_id = get_access(request).caregiver_id
         student_serializer = StudentSerializer(data=request.data)
         student_serializer.is_valid(raise_exception=True)
         student_serializer.save()
@@ -110,7 +210,7 @@ class StudentsResource(_CustomAPIView):
         # Add a role.
         role_data = {
             "role_name": "caregiver",
-            "caregiver": caregiver.id,
+            "caregiver": caregiver_id,
             "student": student_serializer.data["pk"],
         }
         role_serializer = RoleSerializer(data=role_data)
@@ -120,6 +220,121 @@ class StudentsResource(_CustomAPIView):
         return Response(student_serializer.data)
 
 
+class DashboardResource(_CustomAPIView):
+    """
+    Students assigned to current user with their tasks, prizes and latest
+    points, so the home screen is loaded with a single request.
+    User must be authenticated and must be a caregiver.
+
+    Query parameters: 'points' - number of latest points of each student,
+    'fields' - fields of students, 'include' - any of 'tasks', 'prizes', 'points'.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, IsUserCaregiver]
+
+    @conditional_get
+    @cached_response
+    def get(self, request):
+        query_serializer = DashboardQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        points_limit = query_serializer.validated_data["points"]
+        fields = DashboardStudentSerializer.requested_fields(request)
+
+        # Related objects of all students are loaded with one query per
+        # included relation. Points are limited per student with a window
+        # function, sliced querysets are only supported with 'to_attr'.
+        latest_points = Point.objects.order_by("-assignment_date", "-id")
+        prefetches = {
+            "tasks": Prefetch("task_set", queryset=Task.objects.order_by("pk")),
+            "prizes": Prefetch("prize_set", queryset=Prize.objects.order_by("pk")),
+            "points": Prefetch(
+                "point_set",
+                queryset=latest_points[:points_limit],
+                to_attr="latest_points",
+            ),
+        }
+        students = (
+            _students_for_read(fields)
+            .filter(pk__in=get_access(request).student_ids)
+            .order_by("pk")
+            .prefetch_related(
+                *(
+                    prefetch
+                    for name, prefetch in prefetches.items()
+                    if fields is None or name in fields
+                )
+            )
+        )
+
+        return Response(
+            DashboardStudentSerializer(students, many=True, fields=fields).data
+        )
+
+
+class StudentsRankingResource(_CustomAPIView):
+    """
+    Students assigned to current user ranked by their total points.
+    Students with equal points share a rank, ties are listed by ID.
+    User must be authenticated and must be a caregiver.
+
+    Query parameters: 'limit' - number of top students, 'fields' - fields of
+    ranked students.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, IsUserCaregiver]
+
+    def get(self, request):
+        query_serializer = RankingQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        limit = query_serializer.validated_data["limit"]
+        fields = RankedStudentSerializer.requested_fields(request)
+
+        # Roles of the caregiver are read in order from 'role_ranking_idx',
+        # so only 'limit' rows are visited. Points are needed to compute ranks.
+        students = list(
+            _students_for_read(fields and (*fields, "total_points"))
+            .filter(role__caregiver_id=get_access(request).caregiver_id)
+            .order_by("-role__total_points", "role__student_id")[:limit]
+        )
+        for position, student in enumerate(students):
+            if position and student.total_points == students[position - 1].total_points:
+                student.rank = students[position - 1].rank
+            else:
+                student.rank = position + 1
+
+        return Response(
+            RankedStudentSerializer(students, many=True, fields=fields).data
+        )
+
+
+class StudentRankResource(_CustomAPIView):
+    """
+    Rank of the student among students assigned to current user.
+    User must be authenticated and must be assigned to the accessed student.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, HasUserAccessToStudent]
+
+    def get(self, request, student_id):
+        access = get_access(request)
+        roles = Role.objects.filter(caregiver_id=access.caregiver_id)
+        total_points = self.get_object(
+            roles.values_list("total_points", flat=True), student_id=student_id
+        )
+        # Roles of students with more points are counted from a range of
+        # 'role_ranking_idx', students table isn't read.
+        higher = roles.filter(total_points__gt=total_points).count()
+
+        return Response(
+            {
+                "pk": student_id,
+                "rank": higher + 1,
+                "total_points": total_points,
+                "students": len(access.student_ids),
+            }
+        )
+
+
 class SingleStudentResource(_CustomAPIView):
     """
     Access single student assigned to current user.
@@ -129,14 +344,17 @@ class SingleStudentResource(_CustomAPIView):
     serializer_class = StudentSerializer
     permission_classes = [permissions.IsAuthenticated, HasUserAccessToStudent]
 
+    @conditional_get
+    @cached_response
     def get(self, request, student_id):
-        student = self.get_object(Student, pk=student_id)
-        serializer = StudentSerializer(student)
+        fields = StudentSerializer.requested_fields(request)
+        student = self.get_object(_students_for_read(fields), pk=student_id)
+        serializer = StudentSerializer(student, fields=fields)
 
         return Response(serializer.data)
 
     def patch(self, request, student_id):
-        student = self.get_object(Student, pk=student_id)
+        student = self.get_object(Student.objects.select_related("user"), pk=student_id)
         serializer = StudentSerializer(student, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
@@ -151,13 +369,21 @@ class PrizesResource(_CustomAPIView):
     """
 
     serializer_class = PrizeSerializer
+    version_field = "prizes_version"
     permission_classes = [permissions.IsAuthenticated, HasUserAccessToStudent]
+    pagination_class = CustomCursorPagination
 
+    @conditional_get
+    @cached_response
     def get(self, request, student_id):
+        fields = PrizeValuesSerializer.requested_fields(request)
         prizes = Prize.objects.filter(student_id=student_id)
-        serializer = PrizeSerializer(prizes, many=True)
 
-        return Response(serializer.data)
+        return self.list_response(
+            PrizeValuesSerializer.values(prizes, fields),
+            PrizeValuesSerializer,
+            fields,
+        )
 
     def post(self, request, student_id):
         serializer = PrizeSerializer(data=request.data)
@@ -174,11 +400,18 @@ class SinglePrizeResource(_CustomAPIView):
     """
 
     serializer_class = PrizeSerializer
+    version_field = "prizes_version"
     permission_classes = [permissions.IsAuthenticated, HasUserAccessToStudent]
 
+    @conditional_get
     def get(self, request, student_id, prize_id):
-        prize = self.get_object(Prize, pk=prize_id, student_id=student_id)
-        serializer = PrizeSerializer(prize)
+        fields = PrizeValuesSerializer.requested_fields(request)
+        prize = self.get_object(
+            Prize.objects.only(*PrizeValuesSerializer.selected_columns(fields)),
+            pk=prize_id,
+            student_id=student_id,
+        )
+        serializer = PrizeSerializer(prize, fields=fields)
 
         return Response(serializer.data)
 
@@ -204,13 +437,21 @@ class TasksResource(_CustomAPIView):
     """
 
     serializer_class = TaskSerializer
+    version_field = "tasks_version"
     permission_classes = [permissions.IsAuthenticated, HasUserAccessToStudent]
+    pagination_class = CustomCursorPagination
 
+    @conditional_get
+    @cached_response
     def get(self, request, student_id):
+        fields = TaskValuesSerializer.requested_fields(request)
         tasks = Task.objects.filter(student_id=student_id)
-        serializer = TaskSerializer(tasks, many=True)
 
-        return Response(serializer.data)
+        return self.list_response(
+            TaskValuesSerializer.values(tasks, fields),
+            TaskValuesSerializer,
+            fields,
+        )
 
     def post(self, request, student_id):
         serializer = TaskSerializer(data=request.data)
@@ -227,11 +468,18 @@ class SingleTaskResource(_CustomAPIView):
     """
 
     serializer_class = TaskSerializer
+    version_field = "tasks_version"
     permission_classes = [permissions.IsAuthenticated, HasUserAccessToStudent]
 
+    @conditional_get
     def get(self, request, student_id, task_id):
-        task = self.get_object(Task, pk=task_id, student_id=student_id)
-        serializer = TaskSerializer(task)
+        fields = TaskValuesSerializer.requested_fields(request)
+        task = self.get_object(
+            Task.objects.only(*TaskValuesSerializer.selected_columns(fields)),
+            pk=task_id,
+            student_id=student_id,
+        )
+        serializer = TaskSerializer(task, fields=fields)
 
         return Response(serializer.data)
 
@@ -258,52 +506,246 @@ class PointResource(_CustomAPIView):
     """
 
     permission_classes = [permissions.IsAuthenticated, HasUserAccessToStudent]
+    pagination_class = PointsCursorPagination
 
+    @conditional_get
     def get(self, request, student_id):
+        fields = PointValuesSerializer.requested_fields(request)
         points = Point.objects.filter(student_id=student_id).order_by(
-            "-assignment_date"
+            "-assignment_date", "-id"
         )
-        serializer = PointSerializer(points, many=True)
 
-        return Response(serializer.data)
+        return self.list_response(
+            PointValuesSerializer.values(points, fields), PointValuesSerializer, fields
+        )
 
     def post(self, request, student_id):
-        content_type = request.data.get("content_type")
-        object_id = request.data.get("object_id")
-        student = Student.objects.get(pk=student_id)
-
-        # Get points type and points difference.
-        if content_type == "task":
-            content_object = Task.objects.get(pk=object_id, student=student)
-            total_points_diff = content_object.value
-        elif content_type == "prize":
-            content_object = Prize.objects.get(pk=object_id, student=student)
-            total_points_diff = -content_object.value
+        entry_serializer = NewPointSerializer(data=request.data)
+        entry_serializer.is_valid(raise_exception=True)
+        content_type = entry_serializer.validated_data["content_type"]
+        object_id = entry_serializer.validated_data["object_id"]
+
+        # Get model of the content object.
+        content_model = POINT_SOURCE_MODELS[content_type]
+
+        # Only ID, value and name of the content object are needed.
+        content_object = (
+            content_model.objects.filter(pk=object_id, student_id=student_id)
+            .values_list("pk", "value", "name")
+            .first()
+        )
+        if content_object is None:
+            raise _NotFoundOrPermissionDenied()
+        object_pk, value, name = content_object
+
+        # Update total points and add new Point.
+        point = record_point(
+            new_point(
+                student_id=student_id,
+                assigner_id=get_access(request).caregiver_id,
+                points_type=content_type,
+                object_id=object_pk,
+                value=value,
+                name=name,
+            )
+        )
+        point_serializer = PointSerializer(point)
+
+        return Response(status=status.HTTP_201_CREATED, data=point_serializer.data)
+
+
+class PointsExportResource(_CustomAPIView):
+    """
+    Export the whole points history of the student as CSV or NDJSON file.
+    User must be authenticated and must be assigned to the accessed student.
+
+    Rows are streamed from a server-side cursor, newest first.
+    Query parameters: 'file_format' ('csv' or 'ndjson').
+    """
+
+    permission_classes = [permissions.IsAuthenticated, HasUserAccessToStudent]
+
+    # Number of rows fetched from the database at once.
+    CHUNK_SIZE = 2000
+    # Number of rows encoded and sent at once.
+    BATCH_SIZE = 500
+
+    def get(self, request, student_id):
+        query_serializer = PointsExportQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        if query_serializer.validated_data["file_format"] == (
+            PointsExportQuerySerializer.NDJSON
+        ):
+            # First default renderer is the JSON renderer, see settings.
+            encoder = NDJSONEncoder(api_settings.DEFAULT_RENDERER_CLASSES[0]())
         else:
-            return Response(status=status.HTTP_400_BAD_REQUEST)
-        caregiver = Caregiver.objects.get(user=request.user)
-        content_type_obj = ContentType.objects.get(model=content_type)
-
-        # Update student with new total points.
-        new_total_points = student.total_points + total_points_diff
-        student_data = {"total_points": new_total_points}
-        student_serializer = StudentSerializer(student, data=student_data, partial=True)
-        student_serializer.is_valid(raise_exception=True)
-        student_serializer.save()
+            encoder = CSVEncoder(PointSerializer.Meta.fields)
 
-        # Add new Point.
-        point_serializer = PointSerializer(
-            data={
-                "student": student.pk,
-                "assigner": caregiver.pk,
-                "value": content_object.value,
-                "content_object": content_object,
-                "points_type": content_type,
-                "content_type": content_type_obj.pk,
-                "object_id": object_id,
+        points = PointValuesSerializer.values(
+            Point.objects.filter(student_id=student_id).order_by(
+                "-assignment_date", "-id"
+            )
+        )
+        to_representation = PointValuesSerializer(points).row_serializer()
+        content = self.stream_content(points, to_representation, encoder)
+
+        response = StreamingHttpResponse(content, content_type=encoder.content_type)
+        response["Content-Disposition"] = (
+            f'attachment; filename="student_{student_id}_points.{encoder.extension}"'
+        )
+        return response
+
+    def stream_content(self, points, to_representation, encoder):
+        """
+        Return iterator of encoded batches of 'points'.
+        ASGI server needs an async iterator, see 'AsyncPointsExportResource'.
+        """
+        return stream(
+            points.iterator(chunk_size=self.CHUNK_SIZE),
+            to_representation,
+            encoder,
+            self.BATCH_SIZE,
+        )
+
+
+class BulkPointResource(_CustomAPIView):
+    """
+    Assign points to many students at once, eg. reward the whole class for a task.
+    User must be authenticated and must be a caregiver.
+
+    Request is a list of '{"student", "content_type", "object_id"}' entries.
+    Response contains a result for each entry, in the same order.
+    Status is '201 Created' when all points are created, '207 Multi-Status'
+    otherwise, with status of each entry in its result.
+    Number of queries doesn't depend on the number of entries.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, IsUserCaregiver]
+
+    # Maximum number of entries in a single request.
+    MAX_ENTRIES = 500
+
+    def post(self, request):
+        entries_serializer = BulkPointSerializer(
+            data=request.data, many=True, allow_empty=False, max_length=self.MAX_ENTRIES
+        )
+        entries_serializer.is_valid(raise_exception=True)
+        entries = entries_serializer.validated_data
+
+        access = get_access(request)
+
+        # Resolve values of content objects, one query for each points type.
+        content_objects = {}
+        for points_type, content_model in POINT_SOURCE_MODELS.items():
+            object_ids = {
+                entry["object_id"]
+                for entry in entries
+                if entry["content_type"] == points_type
+                and entry["student"] in access.student_ids
             }
+            if object_ids:
+                content_objects[points_type] = {
+                    pk: (student_id, value, name)
+                    for pk, student_id, value, name in content_model.objects.filter(
+                        pk__in=object_ids
+                    ).values_list("pk", "student_id", "value", "name")
+                }
+
+        # Prepare points, entries not available for current user are rejected.
+        results = [None] * len(entries)
+        points = []
+        indices = []
+        for index, entry in enumerate(entries):
+            student_id = entry["student"]
+            points_type = entry["content_type"]
+            content_object = content_objects.get(points_type, {}).get(
+                entry["object_id"]
+            )
+            if (
+                student_id not in access.student_ids
+                or content_object is None
+                or content_object[0] != student_id
+            ):
+                results[index] = {
+                    "status": status.HTTP_404_NOT_FOUND,
+                    "detail": _NotFoundOrPermissionDenied.default_detail,
+                }
+                continue
+            points.append(
+                new_point(
+                    student_id=student_id,
+                    assigner_id=access.caregiver_id,
+                    points_type=points_type,
+                    object_id=entry["object_id"],
+                    value=content_object[1],
+                    name=content_object[2],
+                )
+            )
+            indices.append(index)
+
+        # Save points and update total points.
+        for index, result in zip(indices, record_points(points)):
+            if isinstance(result, Point):
+                results[index] = {
+                    "status": status.HTTP_201_CREATED,
+                    "point": PointSerializer(result).data,
+                }
+            else:
+                results[index] = {
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "errors": result.detail,
+                }
+
+        if all(result["status"] == status.HTTP_201_CREATED for result in results):
+            return Response(results, status=status.HTTP_201_CREATED)
+        return Response(results, status=status.HTTP_207_MULTI_STATUS)
+
+
+class PointsStatsResource(_CustomAPIView):
+    """
+    Points of the student summed up per day or week, read from 'DailyPoints'.
+    User must be authenticated and must be assigned to the accessed student.
+
+    Query parameters: 'bucket' ('day' or 'week'), 'since' and 'until' dates.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, HasUserAccessToStudent]
+
+    def get(self, request, student_id):
+        query_serializer = PointsStatsQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        query = query_serializer.validated_data
+
+        if query["bucket"] == PointsStatsQuerySerializer.WEEK:
+            period = TruncWeek("day")
+        else:
+            period = F("day")
+        rows = (
+            DailyPoints.objects.filter(
+                student_id=student_id,
+                day__gte=query["since"],
+                day__lte=query["until"],
+            )
+            .annotate(period=period)
+            .values("period", "points_type")
+            .annotate(total=Sum("total"), count=Sum("count"))
+            .order_by("period")
         )
-        point_serializer.is_valid(raise_exception=True)
-        point_serializer.save()
 
-        return Response(status=status.HTTP_201_CREATED, data=point_serializer.data)
+        # One entry per period, with totals of both points types.
+        stats = {}
+        for row in rows:
+            entry = stats.setdefault(
+                row["period"],
+                {
+                    "date": row["period"].isoformat(),
+                    "task_points": 0,
+                    "task_count": 0,
+                    "prize_points": 0,
+                    "prize_count": 0,
+                },
+            )
+            entry[f"{row['points_type']}_points"] = row["total"]
+            entry[f"{row['points_type']}_count"] = row["count"]
+
+        return Response(list(stats.values()))
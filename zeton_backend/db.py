@@ -0,0 +1,33 @@
+"""
+Database utilities shared by middlewares.
+"""
+
+from contextlib import asynccontextmanager
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+
+
+def _add_execute_wrapper(wrapper) -> None:
+    connection.execute_wrappers.append(wrapper)
+
+
+def _remove_execute_wrapper(wrapper) -> None:
+    connection.execute_wrappers.remove(wrapper)
+
+
+@asynccontextmanager
+async def aexecute_wrapper(wrapper):
+    """
+    Async variant of 'connection.execute_wrapper()'.
+
+    Connections are local to threads. Queries of a request handled by the
+    async handler are executed in its thread-sensitive thread (sync views and
+    async ORM calls), not in the thread of the event loop, so the wrapper is
+    installed there.
+    """
+    await sync_to_async(_add_execute_wrapper)(wrapper)
+    try:
+        yield
+    finally:
+        await sync_to_async(_remove_execute_wrapper)(wrapper)
@@ -1,5 +1,133 @@
-from rest_framework.pagination import PageNumberPagination
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    CursorPagination,
+    PageNumberPagination,
+    _reverse_ordering,
+)
 
 
 class CustomPagination(PageNumberPagination):
     page_size_query_param = "page_size"
+
+
+class CustomCursorPagination(CursorPagination):
+    """
+    Keyset pagination, cost of fetching a page doesn't depend on its depth.
+
+    Pagination is enabled only when 'page_size' query parameter is given,
+    otherwise plain list of all entries is returned.
+    """
+
+    page_size = None
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+    ordering = "id"
+
+
+class PointsCursorPagination(CustomCursorPagination):
+    """
+    Keyset pagination of the points history, newest entries first.
+    Matches 'student_points_history_idx' index.
+
+    DRF positions the cursor on the first ordering field only and skips entries
+    sharing it with an offset, which degrades to offset scans when many points
+    share a timestamp (eg. bulk inserts). Here the position is the whole
+    '(assignment_date, id)' key, so it is unique and the offset is always 0.
+    """
+
+    ordering = ("-assignment_date", "-id")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # Same as 'CursorPagination.paginate_queryset', but with the position
+        # compared as a tuple and no offset.
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            reverse, current_position = False, None
+        else:
+            reverse, current_position = self.cursor.reverse, self.cursor.position
+            self.cursor = self.cursor._replace(offset=0)
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            key = self._parse_position(queryset.model, current_position)
+            queryset = queryset.filter(self._following(key, reverse))
+
+        results = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+        else:
+            following_position = None
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None
+            self.has_previous = following_position is not None
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = current_position is not None
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def _get_position_from_instance(self, instance, ordering):
+        names = [field.lstrip("-") for field in ordering]
+        if isinstance(instance, dict):
+            values = [instance[name] for name in names]
+        else:
+            values = [getattr(instance, name) for name in names]
+        return json.dumps([str(value) for value in values])
+
+    def _parse_position(self, model, position):
+        try:
+            values = json.loads(position)
+            names = [field.lstrip("-") for field in self.ordering]
+            if not isinstance(values, list) or len(values) != len(names):
+                raise ValueError
+            return [
+                (name, model._meta.get_field(name).to_python(value))
+                for name, value in zip(names, values)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _following(self, key, reverse):
+        """
+        Condition matching entries after 'key' in the (reversed) ordering.
+        Leading fields are bounded inclusively, eg. 'a <= x AND (a < x OR b < y)',
+        so the index scan starts at the position instead of filtering up to it.
+        """
+        condition = None
+        for field, (name, value) in reversed(list(zip(self.ordering, key))):
+            lookup = "lt" if field.startswith("-") != reverse else "gt"
+            strict = Q(**{f"{name}__{lookup}": value})
+            if condition is None:
+                condition = strict
+            else:
+                condition = Q(**{f"{name}__{lookup}e": value}) & (strict | condition)
+        return condition
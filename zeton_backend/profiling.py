@@ -0,0 +1,381 @@
+"""
+Opt-in profiling of sampled requests.
+
+'ProfilingMiddleware' is enabled with 'PROFILING' setting and profiles
+'PROFILING_SAMPLE_RATE' fraction of requests. Each profiled request records:
+
+- 'duration_ms' - wall time of the request,
+- 'cpu_ms' - CPU time of the thread handling the request,
+- 'queries' and 'sql_ms' - number and time of SQL queries,
+- 'serialize_ms' - time of serializers, measured with 'serialization()',
+- 'view_ms' - rest of the time spent in the view outside of SQL queries, that
+  is mostly authentication and permission checks,
+- 'render_ms' - time of the renderer of the response, also when it's rendered
+  in the view (eg. to be cached), measured with 'rendering()'.
+
+Measurements are aggregated into histograms per HTTP method and URL route,
+kept in memory of the worker process. They aren't shared: 'api/metrics/'
+returns histograms of the worker which handled the request (its 'pid'), so
+each worker has to be scraped separately. Content of streamed responses is
+generated after the middleware returns, so it isn't measured.
+
+Under ASGI the middleware runs asynchronously, so the request isn't moved to a
+thread. Requests share the thread of the event loop, so their CPU time isn't
+measured.
+"""
+
+import os
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+from rest_framework.renderers import BaseRenderer
+
+from .db import aexecute_wrapper
+
+# Upper bounds of histogram buckets.
+TIME_BUCKETS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+QUERIES_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+METRICS = {
+    "duration_ms": ("Wall time of the request.", TIME_BUCKETS),
+    "cpu_ms": ("CPU time of the request.", TIME_BUCKETS),
+    "queries": ("Number of SQL queries.", QUERIES_BUCKETS),
+    "sql_ms": ("Time of SQL queries.", TIME_BUCKETS),
+    "serialize_ms": ("Time of serializers outside of SQL queries.", TIME_BUCKETS),
+    "view_ms": ("Rest of the time of the view outside of SQL queries.", TIME_BUCKETS),
+    "render_ms": ("Time of the renderer of the response.", TIME_BUCKETS),
+}
+
+
+class Histogram:
+    """
+    Histogram with fixed buckets, like Prometheus histograms.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        # Last bucket counts values above all bounds.
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def as_dict(self) -> dict:
+        """
+        Return count, sum and cumulative counts of buckets by upper bounds.
+        """
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip((*self.bounds, "+Inf"), self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {"count": self.count, "sum": round(self.sum, 3), "buckets": buckets}
+
+
+_lock = threading.Lock()
+_histograms: dict[tuple[str, str], dict[str, Histogram]] = {}
+# Profile of the current request, 'None' when it isn't sampled.
+_profile: ContextVar["RequestProfile | None"] = ContextVar("profile", default=None)
+
+
+def record(method: str, route: str, values: dict[str, float]) -> None:
+    """
+    Add values of metrics of a request to histograms of its route.
+    """
+    with _lock:
+        histograms = _histograms.get((method, route))
+        if histograms is None:
+            histograms = _histograms[(method, route)] = {
+                metric: Histogram(bounds) for metric, (_, bounds) in METRICS.items()
+            }
+        for metric, value in values.items():
+            histograms[metric].observe(value)
+
+
+def get_metrics() -> dict:
+    """
+    Return profiling settings and histograms of all profiled routes.
+    """
+    with _lock:
+        routes = [
+            {
+                "method": method,
+                "route": route,
+                **{
+                    metric: histogram.as_dict()
+                    for metric, histogram in histograms.items()
+                },
+            }
+            for (method, route), histograms in sorted(_histograms.items())
+        ]
+    return {
+        "enabled": settings.PROFILING,
+        "sample_rate": settings.PROFILING_SAMPLE_RATE,
+        "pid": os.getpid(),
+        "routes": routes,
+    }
+
+
+def reset() -> None:
+    """
+    Remove all recorded measurements.
+    """
+    with _lock:
+        _histograms.clear()
+
+
+class RequestProfile:
+    """
+    Measurements of a single request.
+    """
+
+    __slots__ = (
+        "queries",
+        "sql",
+        "serialize",
+        "render",
+        "measuring",
+        "view_start",
+        "view",
+    )
+
+    def __init__(self):
+        self.queries = 0
+        self.sql = 0.0
+        self.serialize = 0.0
+        self.render = 0.0
+        # Whether 'serialize' or 'render' is being measured.
+        self.measuring = False
+        self.view_start = None
+        # Time of the view outside of other measurements, set when it returns.
+        self.view = None
+
+    def execute(self, execute, sql, params, many, context):
+        """
+        Database execute wrapper counting queries and their time.
+        """
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql += time.perf_counter() - start
+            self.queries += 1
+
+    def outside(self, start: float) -> float:
+        """
+        Return time since 'start' outside of SQL queries, serialization and
+        rendering.
+        """
+        measured = self.sql + self.serialize + self.render
+        return max(time.perf_counter() - start - measured, 0.0)
+
+
+@contextmanager
+def _measure(attribute: str):
+    """
+    Add time of the block outside of SQL queries (eg. of lazy querysets) to
+    'attribute' of the profile of the current request, if it's profiled.
+    Nested blocks are measured by the outermost one.
+    """
+    profile = _profile.get()
+    if profile is None or profile.measuring:
+        yield
+        return
+
+    profile.measuring = True
+    start = time.perf_counter()
+    sql = profile.sql
+    try:
+        yield
+    finally:
+        profile.measuring = False
+        elapsed = time.perf_counter() - start - (profile.sql - sql)
+        setattr(profile, attribute, getattr(profile, attribute) + elapsed)
+
+
+def serialization():
+    """
+    Measure the block as serialization of the current request.
+    """
+    return _measure("serialize")
+
+
+def rendering():
+    """
+    Measure the block as rendering of the current request.
+    """
+    return _measure("render")
+
+
+def _timed_render(render):
+    def timed_render(*args, **kwargs):
+        with rendering():
+            return render(*args, **kwargs)
+
+    return timed_render
+
+
+class ProfilingMiddleware:
+    """
+    Middleware profiling sampled requests, see module docstring.
+    It should be the first middleware, so the whole request is measured.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # Hooks are awaited by the async handler, sync ones would be run
+            # in a thread.
+            self.process_view = self.aprocess_view
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if random.random() >= settings.PROFILING_SAMPLE_RATE:
+            return self.get_response(request)
+
+        profile = request._profile = RequestProfile()
+        token = _profile.set(profile)
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            with connection.execute_wrapper(profile.execute):
+                response = self.get_response(request)
+        finally:
+            _profile.reset(token)
+        cpu = time.thread_time() - cpu_start
+        self.record(request, profile, start, {"cpu_ms": cpu * 1000})
+        return response
+
+    async def __acall__(self, request):
+        if random.random() >= settings.PROFILING_SAMPLE_RATE:
+            return await self.get_response(request)
+
+        profile = request._profile = RequestProfile()
+        token = _profile.set(profile)
+        start = time.perf_counter()
+        try:
+            async with aexecute_wrapper(profile.execute):
+                response = await self.get_response(request)
+        finally:
+            _profile.reset(token)
+        self.record(request, profile, start, {})
+        return response
+
+    def record(self, request, profile: RequestProfile, start: float, values) -> None:
+        """
+        Record measurements of a request which started at 'start'.
+        """
+        end = time.perf_counter()
+        match = request.resolver_match
+        if match is None or profile.view_start is None:
+            # Request hasn't reached a view.
+            return
+
+        view = (
+            profile.outside(profile.view_start)
+            if profile.view is None
+            else profile.view
+        )
+        record(
+            request.method,
+            match.route,
+            {
+                "duration_ms": (end - start) * 1000,
+                **values,
+                "queries": profile.queries,
+                "sql_ms": profile.sql * 1000,
+                "serialize_ms": profile.serialize * 1000,
+                "view_ms": view * 1000,
+                "render_ms": profile.render * 1000,
+            },
+        )
+
+    @staticmethod
+    def view_started(request) -> None:
+        profile = getattr(request, "_profile", None)
+        if profile is not None:
+            profile.view_start = time.perf_counter()
+
+    @staticmethod
+    def view_finished(request, response) -> None:
+        # DRF responses are rendered after this hook, with their own instance
+        # of the renderer.
+        profile = getattr(request, "_profile", None)
+        if profile is not None:
+            profile.view = profile.outside(profile.view_start)
+            renderer = getattr(response, "accepted_renderer", None)
+            if renderer is not None:
+                renderer.render = _timed_render(renderer.render)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        self.view_started(request)
+
+    def process_template_response(self, request, response):
+        self.view_finished(request, response)
+        return response
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        self.view_started(request)
+
+    async def aprocess_template_response(self, request, response):
+        self.view_finished(request, response)
+        return response
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(
+        '{}="{}"'.format(
+            name,
+            value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in labels.items()
+    )
+
+
+class PrometheusRenderer(BaseRenderer):
+    """
+    Render 'get_metrics()' in Prometheus text format.
+    """
+
+    media_type = "text/plain"
+    format = "prometheus"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        response = (renderer_context or {}).get("response")
+        if response is not None and response.exception:
+            return f"{data.get('detail', data)}\n".encode(self.charset)
+
+        lines = []
+        for metric, (description, _) in METRICS.items():
+            name = f"zeton_request_{metric}"
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} histogram")
+            for route in data["routes"]:
+                labels = _labels(method=route["method"], route=route["route"])
+                histogram = route[metric]
+                for bound, count in histogram["buckets"].items():
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f"{name}_sum{{{labels}}} {histogram['sum']}")
+                lines.append(f"{name}_count{{{labels}}} {histogram['count']}")
+        return ("\n".join(lines) + "\n").encode(self.charset)
@@ -0,0 +1,208 @@
+"""
+Detector of duplicated, N+1 and slow SQL queries.
+
+'QueryDetector' is a database execute wrapper collecting queries, which are
+grouped by their fingerprint (SQL with literals and lists of parameters
+collapsed). Following problems are reported:
+
+- duplicated query - the same statement with the same parameters is executed
+  'QUERY_DETECTOR_DUPLICATES' times or more,
+- N+1 queries - the same statement is executed with different parameters
+  'QUERY_DETECTOR_N_PLUS_ONE' times or more, eg. for each row of a list,
+- slow query - query takes 'QUERY_DETECTOR_SLOW_MS' milliseconds or more.
+
+Each problem points to the innermost frame of project code which executed
+the query. 'QueryDetectorMiddleware' (enabled with 'QUERY_DETECTOR' setting)
+logs problems of each request and raises 'QueryProblemsError' with
+'QUERY_DETECTOR_RAISE', so the whole test suite can be checked.
+"""
+
+import logging
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+
+from .db import aexecute_wrapper
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:%s|\?)\s*,?)+\)", re.IGNORECASE)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    """
+    Return SQL with literals and lists of parameters replaced by placeholders.
+    """
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def _caller() -> str:
+    """
+    Return location of the innermost frame of project code, outside of this module.
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (
+            filename.startswith(settings.BASE_DIR)
+            and filename != __file__
+            and "site-packages" not in filename
+        ):
+            path = os.path.relpath(filename, settings.BASE_DIR)
+            return f"{path}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+@dataclass
+class QueryProblem:
+    """
+    Problem found by 'QueryDetector'.
+    """
+
+    kind: str
+    sql: str
+    count: int
+    duration_ms: float
+    caller: str
+
+    def __str__(self) -> str:
+        return (
+            f"{self.kind} ({self.count}x, {self.duration_ms:.1f} ms) "
+            f"at {self.caller}: {self.sql}"
+        )
+
+
+class QueryProblemsError(Exception):
+    """
+    Raised by 'QueryDetectorMiddleware' with 'QUERY_DETECTOR_RAISE' setting.
+    """
+
+
+class QueryDetector:
+    """
+    Database execute wrapper collecting queries, see module docstring.
+    Thresholds are read from settings unless given.
+    """
+
+    def __init__(
+        self,
+        duplicates: int | None = None,
+        n_plus_one: int | None = None,
+        slow_ms: float | None = None,
+    ):
+        self.duplicates = duplicates or settings.QUERY_DETECTOR_DUPLICATES
+        self.n_plus_one = n_plus_one or settings.QUERY_DETECTOR_N_PLUS_ONE
+        self.slow_ms = (
+            slow_ms if slow_ms is not None else settings.QUERY_DETECTOR_SLOW_MS
+        )
+        # Fingerprint: list of (SQL, parameters, duration, caller).
+        self.queries = defaultdict(list)
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            self.queries[fingerprint(sql)].append(
+                (sql, repr(params), duration_ms, _caller())
+            )
+
+    def problems(self) -> list[QueryProblem]:
+        """
+        Return problems of collected queries.
+        """
+        problems = []
+        for shape, queries in self.queries.items():
+            executions = defaultdict(list)
+            for sql, params, duration_ms, caller in queries:
+                executions[(sql, params)].append((duration_ms, caller))
+                if duration_ms >= self.slow_ms:
+                    problems.append(
+                        QueryProblem("Slow query", sql, 1, duration_ms, caller)
+                    )
+
+            for (sql, _), repeated in executions.items():
+                if len(repeated) >= self.duplicates:
+                    problems.append(
+                        QueryProblem(
+                            "Duplicated query",
+                            sql,
+                            len(repeated),
+                            sum(duration_ms for duration_ms, _ in repeated),
+                            repeated[-1][1],
+                        )
+                    )
+
+            if len(executions) >= self.n_plus_one:
+                problems.append(
+                    QueryProblem(
+                        "N+1 queries",
+                        shape,
+                        len(queries),
+                        sum(query[2] for query in queries),
+                        queries[-1][3],
+                    )
+                )
+        return problems
+
+
+class QueryDetectorMiddleware:
+    """
+    Middleware logging query problems of each request, see module docstring.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        detector = QueryDetector()
+        with connection.execute_wrapper(detector):
+            response = self.get_response(request)
+        self.report(request, detector)
+        return response
+
+    async def __acall__(self, request):
+        detector = QueryDetector()
+        async with aexecute_wrapper(detector):
+            response = await self.get_response(request)
+        self.report(request, detector)
+        return response
+
+    def report(self, request, detector: QueryDetector) -> None:
+        """
+        Log query problems of the request, or raise them.
+        """
+        problems = detector.problems()
+        if problems:
+            match = request.resolver_match
+            view = match.view_name or match.route if match else request.path
+            for problem in problems:
+                logger.warning("%s %s: %s", request.method, view, problem)
+            if settings.QUERY_DETECTOR_RAISE:
+                raise QueryProblemsError(
+                    f"{request.method} {view}:\n"
+                    + "\n".join(str(problem) for problem in problems)
+                )
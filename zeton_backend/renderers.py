@@ -0,0 +1,39 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Line and paragraph separators are escaped by 'JSONRenderer', as they are
+# not valid in JavaScript string literals.
+_SEPARATORS = ((b"\xe2\x80\xa8", b"\\u2028"), (b"\xe2\x80\xa9", b"\\u2029"))
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    'JSONRenderer' backed by orjson.
+
+    Output is the same as output of 'JSONRenderer' with default settings.
+    Types not supported by orjson (eg. 'Decimal', lazy strings) are converted
+    by DRF's 'JSONEncoder'. Indented, non-compact and ASCII-only output is
+    rendered by 'JSONRenderer'.
+    """
+
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+    default = JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        if (
+            self.get_indent(accepted_media_type, renderer_context)
+            or not self.compact
+            or self.ensure_ascii
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self.default, option=self.options)
+        if b"\xe2\x80" in ret:
+            for separator, escaped in _SEPARATORS:
+                ret = ret.replace(separator, escaped)
+        return ret
@@ -15,6 +15,7 @@ import os
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 from utils.conversion import str_to_boolean
+from utils.database import database_from_url
 
 if os.getenv("ENVIRONMENT") == "DEV":
     DEBUG = True
@@ -29,7 +30,7 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = "(^hqe0xol*pc49cq2etgbo*o8_d3o$m@f#!!0_lr&ii3r4+ppa"
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [host for host in os.getenv("ALLOWED_HOSTS", "").split(",") if host]
 CORS_ORIGIN_ALLOW_ALL = str_to_boolean(os.environ.get("CORS_ORIGIN_ALLOW_ALL", "False"))
 
 # Application definition
@@ -59,6 +60,23 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Profiling of sampled requests, see 'zeton_backend.profiling'.
+# Measurements are available at 'api/metrics/' for staff users.
+PROFILING = str_to_boolean(os.getenv("PROFILING", "False"))
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0.1"))
+if PROFILING:
+    MIDDLEWARE.insert(0, "zeton_backend.profiling.ProfilingMiddleware")
+
+# Detection of duplicated, N+1 and slow queries, see 'zeton_backend.query_detector'.
+# Problems are logged, or raised as errors with 'QUERY_DETECTOR_RAISE'.
+QUERY_DETECTOR = str_to_boolean(os.getenv("QUERY_DETECTOR", "False"))
+QUERY_DETECTOR_RAISE = str_to_boolean(os.getenv("QUERY_DETECTOR_RAISE", "False"))
+QUERY_DETECTOR_DUPLICATES = int(os.getenv("QUERY_DETECTOR_DUPLICATES", "2"))
+QUERY_DETECTOR_N_PLUS_ONE = int(os.getenv("QUERY_DETECTOR_N_PLUS_ONE", "3"))
+QUERY_DETECTOR_SLOW_MS = float(os.getenv("QUERY_DETECTOR_SLOW_MS", "100"))
+if QUERY_DETECTOR:
+    MIDDLEWARE.append("zeton_backend.query_detector.QueryDetectorMiddleware")
+
 ROOT_URLCONF = "zeton_backend.urls"
 
 TEMPLATES = [
@@ -79,19 +97,54 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "zeton_backend.wsgi.application"
 
+# Use async variants of read-heavy resources, intended for ASGI servers.
+ASYNC_VIEWS = str_to_boolean(os.getenv("ASYNC_VIEWS", "False"))
+
 # Database
 # https://docs.djangoproject.com/en/3.0/ref/settings/#databases
 
+# Connection is configured with 'DATABASE_URL'.
+# Connections are persistent, 'DB_CONN_MAX_AGE' is their lifetime in seconds.
+# With an external pooler (e.g. PgBouncer), 'DB_CONN_MAX_AGE' should be 0.
+
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.postgresql",
-        "NAME": "postgres",
-        "USER": "postgres",
-        "PASSWORD": "postgres",
-        "HOST": "db",
-        "PORT": "5432",
-    }
+    "default": database_from_url(
+        os.getenv("DATABASE_URL", "postgres://postgres:postgres@db:5432/postgres")
+    )
 }
+DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("DB_CONN_MAX_AGE", "60"))
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = str_to_boolean(
+    os.getenv("DB_CONN_HEALTH_CHECKS", "True")
+)
+# Under ASGI, queries run in threads of 'sync_to_async', which don't reuse
+# persistent connections in Django 4.2, so they would be leaked.
+if ASYNC_VIEWS:
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Local memory cache is used unless 'REDIS_URL' is given, it isn't shared by
+# workers, so 'REDIS_URL' must be set when running more than one process.
+
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Lifetime (in seconds) of cached caregiver's access to students.
+ACCESS_CACHE_TIMEOUT = int(os.getenv("ACCESS_CACHE_TIMEOUT", "300"))
+
+# Lifetime (in seconds) of cached responses of student resources.
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", "600"))
 
 # Password validation
 # https://docs.djangoproject.com/en/3.0/ref/settings/#auth-password-validators
@@ -127,15 +180,35 @@ FIXTURE_DIRS = [os.path.join(BASE_DIR, "fixtures")]
 # Default primary key field type.
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Render and parse JSON with orjson instead of standard 'json' module.
+ORJSON = str_to_boolean(os.getenv("ORJSON", "True"))
+
 REST_FRAMEWORK = {
     # YOUR SETTINGS
+    "DEFAULT_RENDERER_CLASSES": (
+        (
+            "zeton_backend.renderers.ORJSONRenderer"
+            if ORJSON
+            else "rest_framework.renderers.JSONRenderer"
+        ),
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        (
+            "zeton_backend.parsers.ORJSONParser"
+            if ORJSON
+            else "rest_framework.parsers.JSONParser"
+        ),
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",  # Make all endpoints private
         "rest_framework.permissions.AllowAny",
     ),
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "rest_framework_simplejwt.authentication.JWTStatelessUserAuthentication",
         # "rest_framework.authentication.SessionAuthentication",
         # "rest_framework.authentication.BasicAuthentication",
     ),
@@ -149,6 +222,8 @@ SIMPLE_JWT = {
     "SLIDING_TOKEN_LIFETIME": datetime.timedelta(days=30),
     "SLIDING_TOKEN_REFRESH_LIFETIME_LATE_USER": datetime.timedelta(days=1),
     "SLIDING_TOKEN_LIFETIME_LATE_USER": datetime.timedelta(days=30),
+    "TOKEN_OBTAIN_SERIALIZER": "users.serializers.CaregiverTokenObtainPairSerializer",
+    "TOKEN_USER_CLASS": "users.authentication.TokenUser",
 }
 
 SPECTACULAR_SETTINGS = {
@@ -169,12 +244,20 @@ LOGGING = {
             "level": "DEBUG",
             "filters": ["require_debug_true"],
             "class": "logging.StreamHandler",
-        }
+        },
+        "warnings": {
+            "level": "WARNING",
+            "class": "logging.StreamHandler",
+        },
     },
     "loggers": {
         "django.db.backends": {
             "level": "DEBUG",
             "handlers": ["console"],
-        }
+        },
+        "zeton_backend.query_detector": {
+            "level": "WARNING",
+            "handlers": ["warnings"],
+        },
     },
 }